@@ -9,6 +9,7 @@ from maa_mcp.core import (
     controller_info_registry,
     ControllerInfo,
     ControllerType,
+    ensure_toolkit_initialized,
 )
 
 
@@ -26,6 +27,7 @@ from maa_mcp.core import (
 """,
 )
 def find_adb_device_list() -> list[str]:
+    ensure_toolkit_initialized()
     device_list = Toolkit.find_adb_devices()
     for device in device_list:
         object_registry.register_by_name(device.name, device)
@@ -50,6 +52,7 @@ def find_adb_device_list() -> list[str]:
 """,
 )
 def connect_adb_device(device_name: str) -> Optional[str]:
+    ensure_toolkit_initialized()
     device = object_registry.get(device_name)
     if not device:
         return None
@@ -1,11 +1,10 @@
 import atexit
+import os
 from dataclasses import dataclass
 from enum import Enum, auto
-from pathlib import Path
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
-from maa.toolkit import Toolkit
-
 from fastmcp import FastMCP
 
 from maa_mcp import __version__
@@ -13,9 +12,20 @@ from maa_mcp.registry import ObjectRegistry
 from maa_mcp.paths import get_data_dir, ensure_dirs
 
 
-# 确保所有必要的目录存在并初始化 MaaFramework
+# 确保所有必要的目录存在
 ensure_dirs()
-Toolkit.init_option(get_data_dir(), {"stdout_level": 0})
+
+
+@lru_cache(maxsize=1)
+def ensure_toolkit_initialized() -> None:
+    """
+    初始化 MaaFramework Toolkit（仅执行一次）
+
+    延迟到首次发现/连接设备时调用，避免仅查询状态的场景也承担初始化开销。
+    """
+    from maa.toolkit import Toolkit
+
+    Toolkit.init_option(get_data_dir(), {"stdout_level": 0})
 
 
 class ControllerType(Enum):
@@ -41,8 +51,8 @@ object_registry = ObjectRegistry()
 # 控制器信息注册表：controller_id -> ControllerInfo
 controller_info_registry: dict[str, ControllerInfo] = {}
 
-# 记录当前会话保存的截图文件路径，用于退出时清理
-_saved_screenshots: list[Path] = []
+# 记录当前会话保存的截图文件路径（字符串），用于退出时清理
+_saved_screenshots: set[str] = set()
 
 mcp = FastMCP(
     "MaaMCP",
@@ -229,8 +239,12 @@ mcp = FastMCP(
 
 def cleanup_screenshots():
     """清理当前会话保存的临时截图文件"""
+    unlink = os.unlink
     for filepath in _saved_screenshots:
-        filepath.unlink(missing_ok=True)
+        try:
+            unlink(filepath)
+        except FileNotFoundError:
+            pass
     _saved_screenshots.clear()
 
 
@@ -7,6 +7,7 @@
 - Linux: ~/.local/share/MaaMCP/
 """
 
+from functools import cache
 from pathlib import Path
 
 from platformdirs import user_data_dir
@@ -17,9 +18,10 @@ APP_NAME = "MaaMCP"
 APP_AUTHOR = "MaaXYZ"
 
 
+@cache
 def get_data_dir() -> Path:
     """
-    获取应用数据目录
+    获取应用数据目录（进程内只解析一次）
 
     Returns:
         跨平台的用户数据目录路径
@@ -67,6 +69,7 @@ def get_screenshots_dir() -> Path:
     return get_data_dir() / "screenshots"
 
 
+@cache
 def get_logs_dir() -> Path:
     """
     获取日志目录路径
@@ -77,9 +80,10 @@ def get_logs_dir() -> Path:
     return get_data_dir() / "logs"
 
 
+@cache
 def ensure_dirs() -> None:
     """
-    确保所有必要的目录存在
+    确保所有必要的目录存在（进程内只创建一次）
     """
     dirs = [
         get_resource_dir(),
@@ -7,16 +7,23 @@ Pipeline 模块
 包含：
 - logging_config: 日志配置
 - state: 流水线状态管理
+- dedup: 画面去重
 """
 
-from .logging_config import setup_logger, get_logger
-from .state import PipelineState, get_pipeline_state
+from .logging_config import setup_logger, get_logger, is_debug_enabled
+from .state import MessageRingBuffer, PipelineState, get_pipeline_state
+from .dedup import compute_frame_signature, frame_difference
 
 __all__ = [
     # 日志
     "setup_logger",
     "get_logger",
+    "is_debug_enabled",
     # 状态管理
+    "MessageRingBuffer",
     "PipelineState",
     "get_pipeline_state",
+    # 画面去重
+    "compute_frame_signature",
+    "frame_difference",
 ]
@@ -0,0 +1,52 @@
+"""
+画面去重模块
+============
+基于降采样灰度缩略图判断相邻截图是否基本一致，用于跳过重复画面的 OCR。
+逐像素比较缩略图，能分辨单个字符的变化。
+"""
+
+import cv2
+import numpy as np
+
+
+# 画面签名的降采样倍数：每 4x4 像素取平均，仍能分辨单个字符、标点的变化
+_SIGNATURE_SCALE = 4
+
+# 缩略图像素灰度差超过该值才计为变化，吸收缩放和压缩带来的轻微噪声
+_PIXEL_TOLERANCE = 8
+
+
+def compute_frame_signature(image: np.ndarray) -> np.ndarray:
+    """
+    计算画面签名（降采样后的灰度缩略图）
+
+    Args:
+        image: BGR 或灰度图像
+
+    Returns:
+        uint8 灰度缩略图，尺寸为原图的 1/4
+    """
+    height, width = image.shape[:2]
+    size = (max(width // _SIGNATURE_SCALE, 1), max(height // _SIGNATURE_SCALE, 1))
+    small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small
+
+
+def frame_difference(signature_a: np.ndarray, signature_b: np.ndarray) -> int:
+    """
+    计算两个画面签名之间发生变化的缩略图像素数
+
+    尺寸不同（如窗口大小改变）时视为整幅画面都已变化。
+    """
+    if signature_a.shape != signature_b.shape:
+        return signature_a.size
+    diff = cv2.absdiff(signature_a, signature_b)
+    return cv2.countNonZero(cv2.threshold(diff, _PIXEL_TOLERANCE, 255, cv2.THRESH_BINARY)[1])
+
+
+__all__ = [
+    "compute_frame_signature",
+    "frame_difference",
+]
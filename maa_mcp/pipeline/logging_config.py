@@ -6,6 +6,7 @@
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -17,28 +18,47 @@ from maa_mcp.paths import get_logs_dir
 # 标记是否已初始化
 _initialized = False
 
+# 文件日志的级别序号，初始化后设置
+_file_level_no: Optional[int] = None
+
+# 控制台 handler 的 ID 及其级别，未启用控制台输出时为 None
+_console_handler_id: Optional[int] = None
+_console_level: Optional[str] = None
+
 
 def setup_logger(
     file_level: str = "DEBUG",
     error_retention: str = "30 days",
     log_retention: str = "7 days",
+    console: bool = False,
+    console_level: str = "INFO",
 ) -> None:
     """
     配置 loguru 日志系统。
 
     注意：默认只输出日志到文件，不输出到控制台。
-    如果需要临时启用控制台输出，可以取消注释函数内部的控制台输出配置代码。
+    如果需要临时启用控制台输出，可以传入 console=True（输出到 stderr，不影响 MCP 的 stdio 通信）。
+    文件 handler 只在首次调用时注册；控制台输出以最近一次调用的 console 参数为准，
+    始终最多只有一个 stderr handler。
 
     Args:
         file_level: 文件日志级别
         error_retention: 错误日志保留时间
         log_retention: 普通日志保留时间
+        console: 是否同时输出到控制台（stderr）
+        console_level: 控制台日志级别
     """
-    global _initialized
+    global _initialized, _file_level_no
 
-    if _initialized:
-        return
+    if not _initialized:
+        _setup_file_handlers(file_level, error_retention, log_retention)
+        _file_level_no = logger.level(file_level).no
+        _initialized = True
+    _set_console_handler(console, console_level)
 
+
+def _setup_file_handlers(file_level: str, error_retention: str, log_retention: str) -> None:
+    """移除默认 handler 并注册文件日志 handler（只执行一次）"""
     # 获取日志目录
     logs_dir = get_logs_dir()
     logs_dir.mkdir(parents=True, exist_ok=True)
@@ -68,13 +88,46 @@ def setup_logger(
         encoding="utf-8",
     )
 
-    _initialized = True
     logger.bind(module="Logger").info(f"日志系统初始化完成，日志目录: {logs_dir}")
 
 
+def _set_console_handler(console: bool, console_level: str) -> None:
+    """按需添加或移除控制台（stderr）handler，保证最多只有一个"""
+    global _console_handler_id, _console_level
+
+    if console and _console_handler_id is not None and _console_level == console_level:
+        return
+
+    if _console_handler_id is not None:
+        logger.remove(_console_handler_id)
+        _console_handler_id = None
+        _console_level = None
+
+    if console:
+        _console_handler_id = logger.add(
+            sys.stderr,
+            format="{time:HH:mm:ss.SSS} | {level: <8} | {message}",
+            level=console_level,
+        )
+        _console_level = console_level
+
+
+def is_debug_enabled() -> bool:
+    """
+    当前是否有 handler 会记录 DEBUG 级别日志。
+
+    供热路径在格式化逐帧调试日志前判断，避免在日志不会被记录时白白格式化字符串。
+    """
+    debug_no = logger.level("DEBUG").no
+    if _file_level_no is not None and _file_level_no <= debug_no:
+        return True
+    return _console_level is not None and logger.level(_console_level).no <= debug_no
+
+
+@lru_cache(maxsize=32)
 def get_logger(module: str = "Pipeline"):
     """
-    获取带模块标识的 logger。
+    获取带模块标识的 logger（按模块名缓存，相同模块复用同一实例）。
 
     Args:
         module: 模块名称标识
@@ -90,4 +143,4 @@ def get_logger(module: str = "Pipeline"):
 
 
 # 模块级别的便捷导出
-__all__ = ["setup_logger", "get_logger", "logger"]
+__all__ = ["setup_logger", "get_logger", "is_debug_enabled", "logger"]
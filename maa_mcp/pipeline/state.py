@@ -7,53 +7,172 @@
 
 import threading
 from threading import Lock, Event
-from queue import Queue, Empty
-from typing import Optional, Dict, Any
+from queue import Empty, Full
+from typing import Optional, Dict, Any, List, Callable
+
+
+def _new_ocr_message() -> Dict[str, Any]:
+    """创建一个 OCR 消息槽位模板"""
+    return {"type": "ocr", "ocr_results": None, "timestamp": 0.0, "frame_id": 0}
+
+
+class MessageRingBuffer:
+    """
+    单生产者/单消费者（SPSC）环形缓冲区
+
+    流水线线程是唯一的生产者，MCP 工具调用是唯一的消费者。
+    生产者只写 _tail，依赖 GIL 保证单个索引赋值的原子性，写入路径无需加锁。
+    _head 由消费者推进；队列满时生产者也可通过 drop_oldest() 丢弃最旧消息，
+    因此所有移动 _head 的操作共用一把小锁 _head_lock，只有队列满时才会产生竞争。
+    接口与 queue.Queue 的非阻塞方法保持一致。
+
+    槽位字典在初始化时一次性分配，生产者通过 reserve_slot()/commit() 原地填充，
+    消费者取出时复制一份交给调用方，因此每帧不再分配新的消息字典。
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100,
+        slot_factory: Callable[[], Dict[str, Any]] = dict,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity 必须为正整数")
+        self._capacity = capacity
+        self._buf: List[Dict[str, Any]] = [slot_factory() for _ in range(capacity)]
+        self._head = 0  # 下一个待读取位置（在 _head_lock 内移动）
+        self._tail = 0  # 下一个待写入位置（仅生产者写）
+        self._dropped = 0  # 因队列满被丢弃的消息数（在 _head_lock 内更新）
+        self._head_lock = Lock()
+
+    @property
+    def maxsize(self) -> int:
+        return self._capacity
+
+    @property
+    def dropped(self) -> int:
+        """自上次 clear() 以来因队列满而被丢弃的消息数"""
+        return self._dropped
+
+    def reserve_slot(self) -> Dict[str, Any]:
+        """获取下一个可写槽位（生产者），缓冲区已满时抛出 queue.Full"""
+        tail = self._tail
+        if tail - self._head >= self._capacity:
+            raise Full
+        return self._buf[tail % self._capacity]
+
+    def commit(self) -> None:
+        """发布 reserve_slot() 返回的槽位（生产者）"""
+        # 槽位已填充完毕后再推进索引，消费者看到新 tail 时数据已就绪
+        self._tail += 1
+
+    def put_nowait(self, item: Dict[str, Any]) -> None:
+        """写入一条消息，缓冲区已满时抛出 queue.Full"""
+        slot = self.reserve_slot()
+        slot.clear()
+        slot.update(item)
+        self.commit()
+
+    def drop_oldest(self) -> bool:
+        """
+        丢弃最旧的一条消息（生产者在队列满时调用），为新消息腾出槽位
+
+        Returns:
+            是否确实丢弃了消息（消费者恰好读走消息时无需丢弃）
+        """
+        with self._head_lock:
+            head = self._head
+            if self._tail - head < self._capacity:
+                return False
+            self._head = head + 1
+            self._dropped += 1
+            return True
+
+    def get_nowait(self) -> Dict[str, Any]:
+        """读取一条消息的副本，缓冲区为空时抛出 queue.Empty"""
+        with self._head_lock:
+            head = self._head
+            if head == self._tail:
+                raise Empty
+            item = dict(self._buf[head % self._capacity])
+            self._head = head + 1
+            return item
+
+    def drain(self, max_count: int) -> List[Dict[str, Any]]:
+        """一次性读取最多 max_count 条消息的副本，只推进一次 head"""
+        with self._head_lock:
+            head = self._head
+            count = min(max_count, self._tail - head)
+            if count <= 0:
+                return []
+            capacity = self._capacity
+            buf = self._buf
+            items = [dict(buf[(head + i) % capacity]) for i in range(count)]
+            self._head = head + count
+            return items
+
+    def clear(self) -> None:
+        """丢弃所有未读消息并重置丢弃计数（消费者侧操作）"""
+        # 只移动 head，与（唯一的）生产者并发执行也不会产生竞争；
+        # 同一时间只能有一个生产者，由 start_pipeline 在旧线程退出前拒绝启动来保证
+        with self._head_lock:
+            self._head = self._tail
+            self._dropped = 0
+
+    def qsize(self) -> int:
+        """当前缓冲的消息数量"""
+        return self._tail - self._head
+
+    def empty(self) -> bool:
+        return self._head == self._tail
+
+    def full(self) -> bool:
+        return self._tail - self._head >= self._capacity
 
 
 class PipelineState:
     """
-    流水线全局状态（单例，线程安全）
+    流水线全局状态（线程安全）
     
     管理流水线的运行状态、消息队列和统计信息。
-    """
+    全局唯一实例在模块加载时创建，通过 get_pipeline_state() 获取。
 
-    _instance = None
-    _lock = Lock()  # 类属性：全局共享锁
-
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                # 双重检查锁定
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+    锁的划分：
+    - _lock：仅用于 reset/start/stop 等生命周期切换
+    - _screen_lock：保护 last_screen_state 中文字与时间戳的一致性
+    - 统计信息只由单一写入方更新，单个键的读写在 GIL 下是原子的，不加锁
+    """
 
     def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
+        self._lock = Lock()
         self.is_running = False
         self.stop_event = Event()
         self.pipeline_thread: Optional[threading.Thread] = None
-        self.message_queue = Queue(maxsize=100)
+        self.message_queue = MessageRingBuffer(
+            capacity=100, slot_factory=_new_ocr_message
+        )
         self.stats_dict: Dict[str, Any] = {}
         self.last_screen_state: Dict[str, Any] = {}
+        self._screen_lock = Lock()
         self.controller_id: Optional[str] = None
         self.reset()
 
-    def reset(self):
-        """重置流水线状态"""
-        with PipelineState._lock:
+    def reset(self, message_queue_size: Optional[int] = None):
+        """
+        重置流水线状态
+
+        Args:
+            message_queue_size: 消息队列容量，与当前容量不同时重新创建队列（须确保没有线程仍在写入）
+        """
+        with self._lock:
             self.is_running = False
             self.stop_event.clear()
-            # 清空队列
-            while not self.message_queue.empty():
-                try:
-                    self.message_queue.get_nowait()
-                except Empty:
-                    break
+            if message_queue_size is not None and message_queue_size != self.message_queue.maxsize:
+                self.message_queue = MessageRingBuffer(
+                    capacity=message_queue_size, slot_factory=_new_ocr_message
+                )
+            else:
+                # 清空队列
+                self.message_queue.clear()
             self.stats_dict = {
                 "frame_count": 0,
                 "ocr_count": 0,
@@ -61,67 +180,63 @@ class PipelineState:
                 "start_time": 0,
                 "last_update": 0,
             }
-            self.last_screen_state = {}
+            with self._screen_lock:
+                self.last_screen_state = {}
             self.controller_id = None
 
     def start(self, controller_id: str):
         """标记流水线启动"""
-        with PipelineState._lock:
+        with self._lock:
             self.is_running = True
             self.controller_id = controller_id
 
     def stop(self):
         """标记流水线停止"""
-        with PipelineState._lock:
+        with self._lock:
             self.is_running = False
             self.stop_event.set()
 
     def update_stats(self, **kwargs):
-        """更新统计信息"""
-        with PipelineState._lock:
-            for key, value in kwargs.items():
-                self.stats_dict[key] = value
+        """更新统计信息（仅限单一写入方调用）"""
+        self.stats_dict.update(kwargs)
 
     def increment_stat(self, key: str, amount: int = 1):
-        """增加统计计数"""
-        with PipelineState._lock:
-            self.stats_dict[key] = self.stats_dict.get(key, 0) + amount
+        """增加统计计数（仅限单一写入方调用）"""
+        self.stats_dict[key] = self.stats_dict.get(key, 0) + amount
 
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息副本"""
-        with PipelineState._lock:
-            return dict(self.stats_dict)
+        # dict 复制在 GIL 下一次完成，无需加锁
+        return dict(self.stats_dict)
 
     def update_screen_state(self, texts: list, timestamp: float):
         """更新屏幕状态"""
-        with PipelineState._lock:
+        with self._screen_lock:
             self.last_screen_state["texts"] = texts
             self.last_screen_state["timestamp"] = timestamp
 
     def get_screen_state(self) -> Dict[str, Any]:
         """获取屏幕状态副本"""
-        with PipelineState._lock:
+        with self._screen_lock:
             return dict(self.last_screen_state)
 
 
-# 全局状态实例（懒加载）
-_pipeline_state: Optional[PipelineState] = None
+# 全局状态实例（模块加载时创建）
+_pipeline_state = PipelineState()
 
 
 def get_pipeline_state() -> PipelineState:
     """
-    获取流水线状态单例实例
+    获取全局流水线状态实例
     
     Returns:
         PipelineState 实例
     """
-    global _pipeline_state
-    if _pipeline_state is None:
-        _pipeline_state = PipelineState()
     return _pipeline_state
 
 
 __all__ = [
+    "MessageRingBuffer",
     "PipelineState",
     "get_pipeline_state",
 ]
@@ -7,32 +7,32 @@
 使用方法：
 作为 MCP 服务器运行 (替代 __main__.py):
    python maa_mcp/pipeline_server.py
+
+注意：基础工具（连接设备、截图、OCR、点击等）由 main() 注册，
+直接导入本模块的 mcp 对象只包含流水线工具。
 """
 
+import importlib
 import time
 from threading import Thread, Event
-from queue import Queue, Empty, Full
+from queue import Full
 from typing import List, Dict, Any
 
 # 导入 MCP Core 和 Registry
 from maa_mcp.core import mcp, controller_info_registry, object_registry
 
-# 导入功能模块以注册基础工具
-import maa_mcp.adb
-import maa_mcp.win32
-import maa_mcp.vision
-import maa_mcp.control
-import maa_mcp.utils
-import maa_mcp.resource
-
 # 导入 Pipeline 子模块
 from dataclasses import dataclass
 
 from maa_mcp.pipeline import (
     setup_logger,
     get_logger,
+    is_debug_enabled,
+    MessageRingBuffer,
     PipelineState,
     get_pipeline_state,
+    compute_frame_signature,
+    frame_difference,
 )
 
 
@@ -43,15 +43,30 @@ class PipelineConfig:
 
     screenshot_fps: float = 2.0  # 截图帧率
     message_queue_size: int = 100  # 消息队列大小
-    similarity_threshold: int = 5  # 图像相似度阈值
+    similarity_threshold: int = 0  # 去重时允许变化的缩略图像素数，0 表示任何可见变化都会推送
     enable_dedup: bool = True  # 启用消息去重
 
 
 # UI 元素过滤列表（用于消息去重时过滤 UI 文本）
-UI_ELEMENTS_FILTER = {"微信", "发送", "输入", "语音", "表情", "更多"}
+UI_ELEMENTS_FILTER = frozenset({"微信", "发送", "输入", "语音", "表情", "更多"})
+
+# 基础工具所在模块，由 main() 在服务启动时导入以注册工具
+# （直接导入本模块的 mcp，如 fastmcp run，只会暴露流水线工具）
+_TOOL_MODULES = (
+    "maa_mcp.adb",
+    "maa_mcp.win32",
+    "maa_mcp.vision",
+    "maa_mcp.control",
+    "maa_mcp.utils",
+    "maa_mcp.resource",
+)
+
+
+def _ensure_tools_registered() -> None:
+    """导入功能模块以注册基础工具（模块只会被导入一次，重复调用无副作用）"""
+    for module_name in _TOOL_MODULES:
+        importlib.import_module(module_name)
 
-# 导入现有的工具实现函数（内部函数，可直接调用）
-from maa_mcp.vision import _ocr_impl
 
 # ==================== 初始化日志 ====================
 
@@ -64,83 +79,132 @@ logger = get_logger("PipelineServer")
 
 def run_pipeline_loop(
     controller_id: str,
-    config_dict: Dict,
+    config: PipelineConfig,
     stop_event: Event,
-    message_queue: Queue,
+    message_queue: MessageRingBuffer,
 ):
     """
     流水线主循环（多线程版）
 
     后台线程持续截图并执行 OCR，将 OCR 文字结果传递给大模型。
     大模型直接使用文字结果进行决策，无需处理图片。
+    启用去重时，与上一次推送的画面相似的截图会被跳过，不再执行 OCR；
+    与上一次推送不同的画面（包括切回之前出现过的画面）总会重新推送。
 
     Args:
         controller_id: 控制器 ID
-        config_dict: 配置字典
+        config: 流水线配置
         stop_event: 停止事件
         message_queue: 消息队列（存放 OCR 结果）
     """
+    # 导入现有的工具实现函数（内部函数，可直接调用），延迟到线程启动时加载
+    from maa_mcp.vision import _ocr_impl, _screencap_image
+
     thread_logger = get_logger("PipelineLoop")
 
     thread_logger.debug(f"[初始化] 流水线线程启动")
     thread_logger.debug(f"[初始化] controller_id={controller_id}")
     thread_logger.info(f"流水线线程启动，控制器: {controller_id}")
 
-    fps = config_dict.get("fps", 2.0)
+    fps = config.screenshot_fps
+    enable_dedup = config.enable_dedup
+    similarity_threshold = config.similarity_threshold
     frame_count = 0
     interval = 1.0 / fps
-
-    thread_logger.debug(f"[初始化] fps={fps}, interval={interval}s")
+    # 上一次成功推送的画面签名，用于跳过连续的相似画面
+    last_signature = None
+    # 逐帧调试日志只在配置的日志级别会记录 DEBUG 时才格式化，线程启动时确定一次
+    debug_enabled = is_debug_enabled()
+
+    thread_logger.debug(
+        f"[初始化] fps={fps}, interval={interval}s, "
+        f"enable_dedup={enable_dedup}, similarity_threshold={similarity_threshold}"
+    )
     thread_logger.info("流水线初始化完成，开始主循环（OCR 模式）")
 
-    while not stop_event.is_set():
+    # 预先绑定循环内频繁访问的函数，省去每帧的属性查找
+    monotonic = time.monotonic
+    wall_time = time.time
+    sleep = time.sleep
+    is_stopped = stop_event.is_set
+    reserve_slot = message_queue.reserve_slot
+    commit = message_queue.commit
+
+    # 下一帧的计划开始时间（单调时钟，不受系统时间调整影响）
+    next_deadline = monotonic()
+
+    while not is_stopped():
         try:
-            loop_start = time.time()
             frame_count += 1
 
-            thread_logger.debug(f"[Frame {frame_count}] 开始 OCR...")
+            image = _screencap_image(controller_id)
+            if image is None:
+                if debug_enabled:
+                    thread_logger.debug(f"[Frame {frame_count}] 截图失败: None")
+                continue
+
+            signature = None
+            if enable_dedup:
+                signature = compute_frame_signature(image)
+                if (
+                    last_signature is not None
+                    and frame_difference(signature, last_signature) <= similarity_threshold
+                ):
+                    if debug_enabled:
+                        thread_logger.debug(f"[Frame {frame_count}] 画面无变化，跳过 OCR")
+                    continue
+
+            if debug_enabled:
+                thread_logger.debug(f"[Frame {frame_count}] 开始 OCR...")
 
-            # 调用 vision.py 中的 _ocr_impl，执行截图+OCR
-            ocr_results = _ocr_impl(controller_id)
+            # 调用 vision.py 中的 _ocr_impl，对已截取的画面执行 OCR
+            ocr_results = _ocr_impl(controller_id, image)
 
             # 处理 OCR 返回值
             if ocr_results is None:
-                thread_logger.debug(f"[Frame {frame_count}] OCR 失败: None")
-                time.sleep(interval)
+                if debug_enabled:
+                    thread_logger.debug(f"[Frame {frame_count}] OCR 失败: None")
                 continue
 
             # 检查是否为错误信息（字符串）
             if isinstance(ocr_results, str):
                 thread_logger.warning(f"[Frame {frame_count}] OCR 错误: {ocr_results}")
-                time.sleep(interval)
                 continue
 
-            thread_logger.debug(f"[Frame {frame_count}] OCR 成功，结果条数: {len(ocr_results)}")
+            if debug_enabled:
+                thread_logger.debug(f"[Frame {frame_count}] OCR 成功，结果条数: {len(ocr_results)}")
 
-            # 将 OCR 结果放入消息队列
-            message_data = {
-                "type": "ocr",
-                "ocr_results": ocr_results,
-                "timestamp": time.time(),
-                "frame_id": frame_count,
-            }
+            # 将 OCR 结果原地写入消息队列的预分配槽位
             try:
-                message_queue.put_nowait(message_data)
-                thread_logger.info(f"📷 OCR 结果: {len(ocr_results)} 条")
+                slot = reserve_slot()
             except Full:
-                thread_logger.warning(f"[Frame {frame_count}] 消息队列已满，丢弃 OCR 结果")
-
-            elapsed = time.time() - loop_start
-            sleep_time = max(0, interval - elapsed)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+                # 队列已满时丢弃最旧的结果，保证队列中始终是最新的画面；
+                # 消费方可能恰好在此期间取走了消息，只有确实丢弃时才记录
+                if message_queue.drop_oldest():
+                    thread_logger.warning(f"[Frame {frame_count}] 消息队列已满，丢弃最旧的 OCR 结果")
+                slot = reserve_slot()
+            slot["ocr_results"] = ocr_results
+            slot["timestamp"] = wall_time()
+            slot["frame_id"] = frame_count
+            commit()
+            last_signature = signature
+            thread_logger.info(f"📷 OCR 结果: {len(ocr_results)} 条")
 
         except Exception as e:
             thread_logger.error(f"流水线异常: {e}")
-            import traceback
-
-            thread_logger.debug(f"堆栈: {traceback.format_exc()}")
-            time.sleep(1)
+            # 由 loguru 在写入 DEBUG 级别日志时才格式化堆栈
+            thread_logger.opt(exception=True).debug("流水线异常堆栈")
+            sleep(1)
+
+        finally:
+            # 按固定节奏推进下一帧的计划时间，避免每帧的调度误差累积成漂移
+            next_deadline += interval
+            sleep_time = next_deadline - monotonic()
+            if sleep_time > 0:
+                sleep(sleep_time)
+            elif sleep_time < -interval:
+                # 落后超过一帧（如 OCR 耗时过长）时重新对齐，避免连续补帧
+                next_deadline = monotonic()
 
     thread_logger.info("流水线线程已停止")
 
@@ -148,18 +212,34 @@ def run_pipeline_loop(
 # ==================== MCP 工具实现 ====================
 
 
-def _start_pipeline_impl(controller_id: str, fps: float = 2.0) -> str:
+def _start_pipeline_impl(
+    controller_id: str,
+    fps: float = 2.0,
+    enable_dedup: bool = True,
+    similarity_threshold: int = 0,
+) -> str:
     """启动流水线实现"""
     try:
         logger.debug(
-            f"[启动] 收到启动流水线请求: controller_id={controller_id}, fps={fps}"
+            f"[启动] 收到启动流水线请求: controller_id={controller_id}, fps={fps}, "
+            f"enable_dedup={enable_dedup}, similarity_threshold={similarity_threshold}"
         )
 
+        if fps <= 0:
+            return f"❌ fps 必须大于 0: {fps}"
+        if similarity_threshold < 0:
+            return f"❌ similarity_threshold 不能为负数: {similarity_threshold}"
+
         pipeline_state = get_pipeline_state()
 
         if pipeline_state.is_running:
             return "⚠️ 流水线已经在运行中"
 
+        # 消息队列只支持单一生产者：上一个线程未退出（如卡在截图/OCR 中）时不能启动新线程
+        previous_thread = pipeline_state.pipeline_thread
+        if previous_thread is not None and previous_thread.is_alive():
+            return "❌ 上一个流水线线程仍未退出，请稍后再试"
+
         # 获取控制器信息，验证 controller_id 是否有效
         info = controller_info_registry.get(controller_id)
         if not info:
@@ -169,7 +249,13 @@ def _start_pipeline_impl(controller_id: str, fps: float = 2.0) -> str:
         if object_registry.get(controller_id) is None:
             return f"❌ 未找到控制器对象: {controller_id}"
 
-        pipeline_state.reset()
+        config = PipelineConfig(
+            screenshot_fps=fps,
+            enable_dedup=enable_dedup,
+            similarity_threshold=similarity_threshold,
+        )
+
+        pipeline_state.reset(message_queue_size=config.message_queue_size)
         pipeline_state.controller_id = controller_id
         pipeline_state.stats_dict["start_time"] = time.time()
 
@@ -180,7 +266,7 @@ def _start_pipeline_impl(controller_id: str, fps: float = 2.0) -> str:
             target=run_pipeline_loop,
             args=(
                 controller_id,
-                {"fps": fps, "enable_dedup": True},
+                config,
                 pipeline_state.stop_event,
                 pipeline_state.message_queue,
             ),
@@ -210,6 +296,8 @@ def _stop_pipeline_impl() -> str:
         pipeline_state.pipeline_thread.join(timeout=5)
         if pipeline_state.pipeline_thread.is_alive():
             logger.warning("流水线线程未能在5秒内停止")
+            pipeline_state.is_running = False
+            return "⚠️ 流水线线程未能在5秒内停止，将在当前帧结束后退出，退出前无法重新启动"
 
     pipeline_state.is_running = False
     return "✅ 流水线已停止"
@@ -217,14 +305,7 @@ def _stop_pipeline_impl() -> str:
 
 def _get_new_messages_impl(max_count: int = 10) -> List[Dict[str, Any]]:
     """获取消息实现"""
-    pipeline_state = get_pipeline_state()
-    messages = []
-    for _ in range(max_count):
-        try:
-            messages.append(pipeline_state.message_queue.get_nowait())
-        except Empty:
-            break
-    return messages
+    return get_pipeline_state().message_queue.drain(max_count)
 
 
 def _get_pipeline_status_impl() -> Dict[str, Any]:
@@ -238,6 +319,7 @@ def _get_pipeline_status_impl() -> Dict[str, Any]:
         "controller_id": pipeline_state.controller_id,
         "uptime": round(uptime, 1),
         "pending": pipeline_state.message_queue.qsize(),
+        "dropped": pipeline_state.message_queue.dropped,
     }
 
 
@@ -252,6 +334,9 @@ def _get_pipeline_status_impl() -> Dict[str, Any]:
     参数：
     - controller_id: 控制器 ID，由 connect_adb_device() 或 connect_window() 返回
     - fps: 截图帧率（默认 2.0），控制每秒 OCR 次数
+    - enable_dedup: 是否跳过与上一次推送相同的画面（默认 True）
+    - similarity_threshold: 去重时允许变化的缩略图像素数（默认 0，任何可见变化都会推送），
+      画面有轻微动画或闪烁时可适当调大
 
     返回值：
     - 成功：返回包含 "✅" 的成功信息
@@ -259,12 +344,19 @@ def _get_pipeline_status_impl() -> Dict[str, Any]:
 
     说明：
     流水线启动后会在后台线程持续运行，定期截图并执行 OCR，将 OCR 结果放入消息队列。
+    画面与上一次推送时基本一致时会跳过 OCR，不会重复推送相同的结果；
+    画面变化（包括切回之前出现过的画面）后会重新推送，队列中最新的一条始终对应当前画面。
     可通过 get_new_messages() 获取 OCR 结果，大模型直接使用文字结果进行决策。
     同一时间只能运行一个流水线实例。
     """,
 )
-def start_pipeline(controller_id: str, fps: float = 2.0) -> str:
-    return _start_pipeline_impl(controller_id, fps)
+def start_pipeline(
+    controller_id: str,
+    fps: float = 2.0,
+    enable_dedup: bool = True,
+    similarity_threshold: int = 0,
+) -> str:
+    return _start_pipeline_impl(controller_id, fps, enable_dedup, similarity_threshold)
 
 
 @mcp.tool(
@@ -306,6 +398,7 @@ def stop_pipeline() -> str:
     说明：
     此方法为非阻塞调用，立即返回当前队列中的 OCR 结果。
     获取后的消息会从队列中移除，不会重复返回。
+    队列容量有限，积压过多时会丢弃最旧的结果，始终保留最新的画面。
 
     建议用法：
     1. 获取 ocr_results 后，直接使用文字结果进行分析决策
@@ -331,9 +424,11 @@ def get_new_messages(max_count: int = 10) -> List[Dict[str, Any]]:
     - controller_id: 当前绑定的控制器 ID（字符串或 None）
     - uptime: 运行时长（秒，浮点数）
     - pending: 待处理消息数量（整数）
+    - dropped: 因队列满而被丢弃的最旧消息数量（整数）
 
     说明：
     可用于检查流水线是否正常运行，以及监控消息队列的积压情况。
+    dropped 持续增长说明读取频率跟不上 OCR 速度，可调高 get_new_messages 的调用频率或降低 fps。
     """,
 )
 def get_pipeline_status() -> Dict[str, Any]:
@@ -344,6 +439,7 @@ def get_pipeline_status() -> Dict[str, Any]:
 
 
 def main():
+    _ensure_tools_registered()
     # 启动 MCP 服务器
     mcp.run()
 
@@ -1,8 +1,10 @@
-from datetime import datetime
+import itertools
+import os
 from pathlib import Path
 from typing import Optional, Union
 
 import cv2
+import numpy as np
 
 from maa.controller import Controller
 from maa.tasker import TaskDetail
@@ -14,32 +16,54 @@ from maa_mcp.download import check_ocr_files_exist
 from maa_mcp.paths import get_screenshots_dir
 
 
-def _screencap(controller_id: str) -> Optional[str]:
+# 截图文件轮换槽位数量：超出后按顺序覆盖最早的截图文件，避免每次截图都创建新文件
+_SCREENSHOT_SLOTS = 100
+_screenshot_counter = itertools.count()
+# 截图以 JPEG 编码落盘：编码速度约为 PNG 的数倍，文件也更小，足够大模型识图使用
+_SCREENSHOT_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 90]
+
+
+def _screencap_image(controller_id: str) -> Optional[np.ndarray]:
+    """
+    截图并直接返回内存中的图像（不落盘），供流水线等内部逻辑复用
+    """
     controller: Controller | None = object_registry.get(controller_id)
     if not controller:
         return None
-    image = controller.post_screencap().wait().get()
+    return controller.post_screencap().wait().get()
+
+
+def _screencap(controller_id: str) -> Optional[str]:
+    image = _screencap_image(controller_id)
     if image is None:
         return None
     
     # 保存截图到跨平台用户数据目录，返回路径供大模型按需读取
+    # 文件名带进程号，避免多个服务进程互相覆盖截图
     screenshots_dir = get_screenshots_dir()
     screenshots_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    filepath = screenshots_dir / f"screenshot_{timestamp}.png"
-    success = cv2.imwrite(str(filepath), image)
+    index = next(_screenshot_counter)
+    slot = index % _SCREENSHOT_SLOTS
+    filepath = screenshots_dir / f"screenshot_{os.getpid()}_{slot:03d}.jpg"
+    success = cv2.imwrite(str(filepath), image, _SCREENSHOT_JPEG_PARAMS)
     if not success:
         return None
-    # 记录当前会话保存的截图文件路径，用于退出时清理
-    _saved_screenshots.append(filepath)
-    return str(filepath.absolute())
+    path = str(filepath.absolute())
+    # 记录当前会话保存的截图文件路径，用于退出时清理（每个槽位只记录一次）
+    if index < _SCREENSHOT_SLOTS:
+        _saved_screenshots.add(path)
+    return path
+
 
-def _ocr_impl(controller_id: str) -> Optional[Union[list, str]]:
+def _ocr_impl(
+    controller_id: str, image: Optional[np.ndarray] = None
+) -> Optional[Union[list, str]]:
     """
     OCR 核心实现（可被其他模块复用）
     
     参数：
     - controller_id: 控制器 ID
+    - image: 已截取的图像（可选），不提供时自动截图
     
     返回值：
     - 成功：返回识别结果列表
@@ -55,7 +79,8 @@ def _ocr_impl(controller_id: str) -> Optional[Union[list, str]]:
     if not controller or not tasker:
         return None
 
-    image = controller.post_screencap().wait().get()
+    if image is None:
+        image = controller.post_screencap().wait().get()
     info: TaskDetail | None = (
         tasker.post_recognition(JRecognitionType.OCR, JOCR(), image).wait().get()
     )
@@ -96,6 +121,8 @@ def ocr(controller_id: str) -> Optional[Union[list, str]]:
     返回值：
     - 成功：返回截图文件的绝对路径，可通过 read_file 工具读取图片内容
     - 失败：返回 None
+    说明：
+    截图文件按固定数量轮换复用，较早的截图文件会被后续截图覆盖，请在获取路径后及时读取。
     """,
 )
 def screencap(controller_id: str) -> Optional[str]:
@@ -10,6 +10,7 @@ from maa_mcp.core import (
     controller_info_registry,
     ControllerInfo,
     ControllerType,
+    ensure_toolkit_initialized,
 )
 
 # 截图/鼠标/键盘方法名称到枚举值的映射
@@ -48,6 +49,7 @@ _KEYBOARD_METHOD_MAP = {
     """,
 )
 def find_window_list() -> list[str]:
+    ensure_toolkit_initialized()
     window_list = Toolkit.find_desktop_windows()
     for window in window_list:
         object_registry.register_by_name(window.window_name, window)
@@ -98,6 +100,7 @@ def connect_window(
     mouse_method: str = "PostMessage",
     keyboard_method: str = "PostMessage",
 ) -> Optional[str]:
+    ensure_toolkit_initialized()
     window: DesktopWindow | None = object_registry.get(window_name)
     if not window:
         return None
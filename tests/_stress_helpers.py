@@ -0,0 +1,63 @@
+"""压力测试辅助函数 - 供 conftest 夹具和压力测试示例共用"""
+
+from collections.abc import Callable
+from types import SimpleNamespace
+
+
+def tool_fn(func: Callable) -> Callable:
+    """取出可直接调用的函数：FunctionTool 返回其 .fn，普通函数原样返回
+
+    在循环外解析一次，避免每次调用都重复属性查找。
+    """
+    return getattr(func, "fn", func)
+
+
+def acquire_stress_controller() -> SimpleNamespace:
+    """查找并连接一个真实控制器：优先使用第一个 ADB 设备，其次使用第一个 Windows 窗口
+
+    返回的 controller_id 为 None 表示未找到可用设备/窗口。
+    只捕获设备枚举/连接可能抛出的系统级错误（OSError、RuntimeError），
+    编程错误（AttributeError、ImportError 等）会直接抛出，不会被静默吞掉。
+    """
+    from maa_mcp.adb import find_adb_device_list, connect_adb_device
+    from maa_mcp.win32 import find_window_list, connect_window
+    from maa_mcp.core import controller_info_registry
+
+    controller = SimpleNamespace(
+        controller_id=None,
+        device_name=None,
+        window_name=None,
+        controller_type=None,
+    )
+
+    # 尝试获取ADB设备
+    try:
+        device_list = tool_fn(find_adb_device_list)()
+        if device_list:
+            controller.device_name = device_list[0]  # 使用第一个设备
+            controller.controller_id = tool_fn(connect_adb_device)(controller.device_name)
+            print(
+                f"  使用ADB设备: {controller.device_name}, 控制器ID: {controller.controller_id}"
+            )
+    except (OSError, RuntimeError) as e:
+        print(f"  获取ADB设备失败: {e}")
+
+    # 如果没有ADB设备，尝试获取Windows窗口
+    if not controller.controller_id:
+        try:
+            window_list = tool_fn(find_window_list)()
+            if window_list:
+                controller.window_name = window_list[0]  # 使用第一个窗口
+                controller.controller_id = tool_fn(connect_window)(controller.window_name)
+                print(
+                    f"  使用Windows窗口: {controller.window_name}, 控制器ID: {controller.controller_id}"
+                )
+        except (OSError, RuntimeError) as e:
+            print(f"  获取Windows窗口失败: {e}")
+
+    # 控制器类型在整个会话中不变，只查询一次
+    if controller.controller_id:
+        info = controller_info_registry.get(controller.controller_id)
+        controller.controller_type = info.controller_type if info else None
+
+    return controller
@@ -0,0 +1,16 @@
+"""pytest 共享夹具"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tests._stress_helpers import acquire_stress_controller
+
+
+@pytest.fixture(scope="session")
+def stress_controller() -> SimpleNamespace:
+    """整个测试会话共享的真实控制器，设备查找和连接只执行一次；未找到时跳过依赖它的测试"""
+    controller = acquire_stress_controller()
+    if not controller.controller_id:
+        pytest.skip("未检测到可用的真实控制器设备/窗口，跳过压力性能测试")
+    return controller
@@ -112,6 +112,367 @@ class TestRegistry:
         assert registry.count() == 0
 
 
+class TestMessageRingBuffer:
+    """测试流水线消息环形缓冲区"""
+
+    def test_fifo_order(self):
+        """测试先进先出顺序"""
+        from maa_mcp.pipeline import MessageRingBuffer
+
+        buffer = MessageRingBuffer(capacity=4)
+        for i in range(3):
+            buffer.put_nowait({"frame_id": i})
+
+        assert buffer.qsize() == 3
+        assert [buffer.get_nowait()["frame_id"] for _ in range(3)] == [0, 1, 2]
+        assert buffer.empty()
+
+    def test_full_and_empty(self):
+        """测试满/空时抛出与 queue 模块一致的异常"""
+        from queue import Empty, Full
+        from maa_mcp.pipeline import MessageRingBuffer
+
+        buffer = MessageRingBuffer(capacity=2)
+        with pytest.raises(Empty):
+            buffer.get_nowait()
+
+        buffer.put_nowait({"frame_id": 1})
+        buffer.put_nowait({"frame_id": 2})
+        assert buffer.full()
+        with pytest.raises(Full):
+            buffer.put_nowait({"frame_id": 3})
+        with pytest.raises(Full):
+            buffer.reserve_slot()
+
+    def test_wrap_around(self):
+        """测试索引越过容量后仍能正确回绕"""
+        from maa_mcp.pipeline import MessageRingBuffer
+
+        buffer = MessageRingBuffer(capacity=3)
+        for i in range(10):
+            buffer.put_nowait({"frame_id": i})
+            assert buffer.get_nowait()["frame_id"] == i
+        assert buffer.qsize() == 0
+
+    def test_drain(self):
+        """测试批量读取最多 max_count 条消息"""
+        from maa_mcp.pipeline import MessageRingBuffer
+
+        buffer = MessageRingBuffer(capacity=4)
+        for i in range(3):
+            buffer.put_nowait({"frame_id": i})
+
+        assert [m["frame_id"] for m in buffer.drain(2)] == [0, 1]
+        assert [m["frame_id"] for m in buffer.drain(10)] == [2]
+        assert buffer.drain(10) == []
+
+    def test_drop_oldest(self):
+        """测试队列满时丢弃最旧消息"""
+        from maa_mcp.pipeline import MessageRingBuffer
+
+        buffer = MessageRingBuffer(capacity=2)
+        assert buffer.drop_oldest() is False
+
+        for i in range(2):
+            buffer.put_nowait({"frame_id": i})
+        assert buffer.drop_oldest() is True
+        buffer.put_nowait({"frame_id": 2})
+        assert buffer.dropped == 1
+
+        assert [m["frame_id"] for m in buffer.drain(10)] == [1, 2]
+        buffer.clear()
+        assert buffer.dropped == 0
+
+    def test_clear(self):
+        """测试清空后可继续写入"""
+        from maa_mcp.pipeline import MessageRingBuffer
+
+        buffer = MessageRingBuffer(capacity=2)
+        buffer.put_nowait({"frame_id": 1})
+        buffer.put_nowait({"frame_id": 2})
+        buffer.clear()
+
+        assert buffer.empty()
+        buffer.put_nowait({"frame_id": 3})
+        assert buffer.get_nowait()["frame_id"] == 3
+
+    def test_slot_reuse(self):
+        """测试槽位原地复用，取出的消息是独立副本"""
+        from maa_mcp.pipeline import MessageRingBuffer
+
+        buffer = MessageRingBuffer(capacity=1)
+        slot = buffer.reserve_slot()
+        slot["frame_id"] = 1
+        buffer.commit()
+        message = buffer.get_nowait()
+
+        assert buffer.reserve_slot() is slot
+        slot["frame_id"] = 2
+        assert message == {"frame_id": 1}
+
+
+class TestDedup:
+    """测试画面去重签名"""
+
+    def test_identical_images(self):
+        """测试相同画面的签名差异为 0"""
+        import numpy as np
+        from maa_mcp.pipeline import compute_frame_signature, frame_difference
+
+        image = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (48, 1))
+        image = np.dstack([image] * 3)
+
+        signature = compute_frame_signature(image)
+        assert frame_difference(signature, compute_frame_signature(image.copy())) == 0
+
+    def test_different_images(self):
+        """测试明暗方向相反的画面大部分像素都有变化"""
+        import numpy as np
+        from maa_mcp.pipeline import compute_frame_signature, frame_difference
+
+        image = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (48, 1))
+        image = np.dstack([image] * 3)
+        flipped = image[:, ::-1].copy()
+
+        signature = compute_frame_signature(image)
+        assert frame_difference(signature, compute_frame_signature(flipped)) > signature.size // 2
+
+    def test_signature_detects_text_changes(self):
+        """测试画面签名能分辨聊天画面中的文字编辑和输入"""
+        from maa_mcp.pipeline import compute_frame_signature, frame_difference
+
+        def difference(bubble_text, input_text):
+            return frame_difference(
+                compute_frame_signature(_chat_screen("meet at 5pm", "hello,")),
+                compute_frame_signature(_chat_screen(bubble_text, input_text)),
+            )
+
+        assert difference("meet at 5pm", "hello,") == 0
+        assert difference("meet at 6pm", "hello,") > 0  # 编辑气泡文字
+        assert difference("meet at 5pm", "hello.") > 0  # 输入框中的标点变化
+
+    def test_signature_size_change(self):
+        """测试尺寸不同的画面视为全部变化"""
+        import numpy as np
+        from maa_mcp.pipeline import compute_frame_signature, frame_difference
+
+        a = compute_frame_signature(np.zeros((64, 64, 3), dtype=np.uint8))
+        b = compute_frame_signature(np.zeros((32, 64, 3), dtype=np.uint8))
+
+        assert frame_difference(a, b) == a.size
+
+
+class TestLogging:
+    """测试流水线日志配置"""
+
+    def test_setup_logger_idempotent(self):
+        """测试重复初始化不会重复注册 handler"""
+        from maa_mcp.pipeline import setup_logger
+        from maa_mcp.pipeline.logging_config import logger
+
+        setup_logger()
+        handler_count = len(logger._core.handlers)
+        setup_logger()
+
+        assert len(logger._core.handlers) == handler_count
+
+    def test_setup_logger_console(self):
+        """测试初始化之后仍可开关控制台输出，且最多只有一个控制台 handler"""
+        from maa_mcp.pipeline import setup_logger
+        from maa_mcp.pipeline import logging_config
+        from maa_mcp.pipeline.logging_config import logger
+
+        setup_logger()
+        handler_count = len(logger._core.handlers)
+        try:
+            setup_logger(console=True)
+            setup_logger(console=True)
+            assert logging_config._console_handler_id in logger._core.handlers
+            assert len(logger._core.handlers) == handler_count + 1
+
+            setup_logger(console=True, console_level="DEBUG")
+            assert len(logger._core.handlers) == handler_count + 1
+        finally:
+            setup_logger(console=False)
+
+        assert logging_config._console_handler_id is None
+        assert len(logger._core.handlers) == handler_count
+
+    def test_is_debug_enabled(self, monkeypatch):
+        """测试逐帧调试日志开关跟随配置的日志级别"""
+        from maa_mcp.pipeline import is_debug_enabled, setup_logger
+        from maa_mcp.pipeline import logging_config
+
+        setup_logger()
+        assert is_debug_enabled()  # 文件日志默认记录 DEBUG
+
+        monkeypatch.setattr(logging_config, "_file_level_no", logging_config.logger.level("INFO").no)
+        assert not is_debug_enabled()
+        try:
+            setup_logger(console=True, console_level="DEBUG")
+            assert is_debug_enabled()
+        finally:
+            setup_logger(console=False)
+        assert not is_debug_enabled()
+
+
+def _run_pipeline_frames(monkeypatch, frames, buffer=None, **config):
+    """用给定的 (名称, 图像) 帧序列驱动一次流水线主循环，返回消息队列（默认新建容量 16 的队列）
+
+    截图和 OCR 均被替换为桩函数：OCR 结果中的 text 即帧名称，帧序列耗尽后停止循环。
+    """
+    from threading import Event
+
+    import maa_mcp.vision as vision
+    from maa_mcp.pipeline import MessageRingBuffer
+    from maa_mcp.pipeline_server import PipelineConfig, run_pipeline_loop
+
+    stop_event = Event()
+    names = {id(image): name for name, image in frames}
+    images = iter([image for _, image in frames])
+
+    def fake_screencap(controller_id):
+        image = next(images, None)
+        if image is None:
+            stop_event.set()
+        return image
+
+    monkeypatch.setattr(vision, "_screencap_image", fake_screencap)
+    monkeypatch.setattr(
+        vision, "_ocr_impl", lambda controller_id, image: [{"text": names[id(image)]}]
+    )
+
+    if buffer is None:
+        buffer = MessageRingBuffer(capacity=16)
+    run_pipeline_loop("test", PipelineConfig(screenshot_fps=1000, **config), stop_event, buffer)
+    return buffer
+
+
+def _pushed_names(buffer):
+    """取出队列中所有消息对应的帧名称"""
+    return [m["ocr_results"][0]["text"] for m in buffer.drain(100)]
+
+
+def _chat_screen(bubble_text, input_text=""):
+    """生成 1080x2400 的合成聊天画面：一个文字气泡和底部输入框"""
+    import cv2
+    import numpy as np
+
+    image = np.full((2400, 1080, 3), 240, dtype=np.uint8)
+    cv2.rectangle(image, (40, 300), (700, 420), (255, 255, 255), -1)
+    cv2.putText(image, bubble_text, (60, 380), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (20, 20, 20), 3)
+    cv2.rectangle(image, (20, 2260), (1060, 2340), (255, 255, 255), -1)
+    cv2.putText(image, input_text, (40, 2310), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 20, 20), 2)
+    return image
+
+
+def _distinct_screens():
+    """生成三张差异明显的画面：横向渐变、反向渐变、竖条纹"""
+    import numpy as np
+
+    row = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (64, 1))
+    stripes = np.tile((np.arange(64, dtype=np.uint8) // 8 % 2) * 255, (64, 1))
+    return {
+        "A": np.dstack([row] * 3),
+        "B": np.dstack([row[:, ::-1]] * 3),
+        "C": np.dstack([stripes] * 3),
+    }
+
+
+class TestPipelineLoop:
+    """测试流水线主循环（截图与 OCR 使用桩函数）"""
+
+    def test_return_to_previous_screen(self, monkeypatch):
+        """测试切走后又回到之前的画面时会重新推送，最新一条消息始终对应当前画面"""
+        screens = _distinct_screens()
+        sequence = "AAABBAACCA"
+        frames = [(name, screens[name].copy()) for name in sequence]
+
+        buffer = _run_pipeline_frames(monkeypatch, frames)
+
+        assert _pushed_names(buffer) == ["A", "B", "A", "C", "A"]
+
+    def test_changed_chat_screen_is_pushed(self, monkeypatch):
+        """测试聊天文字发生变化的画面会被推送，完全相同的画面被跳过"""
+        frames = [
+            ("5pm", _chat_screen("meet at 5pm")),
+            ("5pm-again", _chat_screen("meet at 5pm")),
+            ("6pm", _chat_screen("meet at 6pm")),
+            ("typing", _chat_screen("meet at 6pm", "h")),
+        ]
+
+        buffer = _run_pipeline_frames(monkeypatch, frames)
+
+        assert _pushed_names(buffer) == ["5pm", "6pm", "typing"]
+
+    def test_dedup_disabled(self, monkeypatch):
+        """测试关闭去重后每一帧都会推送"""
+        screens = _distinct_screens()
+        frames = [(f"A{i}", screens["A"].copy()) for i in range(3)]
+
+        buffer = _run_pipeline_frames(monkeypatch, frames, enable_dedup=False)
+
+        assert _pushed_names(buffer) == ["A0", "A1", "A2"]
+
+    def test_full_queue_drops_oldest(self, monkeypatch):
+        """测试队列满时丢弃最旧结果，并通过 get_pipeline_status 报告丢弃数量"""
+        from maa_mcp.pipeline import MessageRingBuffer, get_pipeline_state
+        from maa_mcp.pipeline_server import _get_pipeline_status_impl
+
+        buffer = MessageRingBuffer(capacity=1)
+        monkeypatch.setattr(get_pipeline_state(), "message_queue", buffer)
+        screens = _distinct_screens()
+        frames = [(name, screens[name]) for name in "ABC"]
+
+        _run_pipeline_frames(monkeypatch, frames, buffer=buffer)
+
+        assert _get_pipeline_status_impl()["dropped"] == 2
+        assert _pushed_names(buffer) == ["C"]
+
+
+    def test_refuse_start_while_previous_thread_alive(self, monkeypatch):
+        """测试上一个流水线线程未退出时拒绝启动，保证消息队列只有一个生产者"""
+        from threading import Event, Thread
+        from maa_mcp.pipeline import get_pipeline_state
+        from maa_mcp.pipeline_server import _start_pipeline_impl
+
+        release = Event()
+        stuck_thread = Thread(target=release.wait, daemon=True)
+        stuck_thread.start()
+        pipeline_state = get_pipeline_state()
+        monkeypatch.setattr(pipeline_state, "pipeline_thread", stuck_thread)
+        try:
+            result = _start_pipeline_impl("test")
+        finally:
+            release.set()
+            stuck_thread.join()
+
+        assert result.startswith("❌")
+        assert pipeline_state.pipeline_thread is stuck_thread
+
+    def test_reject_invalid_config(self):
+        """测试拒绝非正的 fps 和负的相似度阈值"""
+        from maa_mcp.pipeline_server import _start_pipeline_impl
+
+        assert _start_pipeline_impl("test", fps=0).startswith("❌")
+        assert _start_pipeline_impl("test", similarity_threshold=-1).startswith("❌")
+
+    def test_reset_resizes_queue(self):
+        """测试 reset 按配置的容量重建消息队列，容量不变时只清空"""
+        from maa_mcp.pipeline import PipelineState
+
+        state = PipelineState()
+        state.message_queue.put_nowait({"frame_id": 1})
+        queue = state.message_queue
+
+        state.reset(message_queue_size=queue.maxsize)
+        assert state.message_queue is queue
+        assert state.message_queue.empty()
+
+        state.reset(message_queue_size=8)
+        assert state.message_queue.maxsize == 8
+
+
 class TestCore:
     """测试核心模块 - 需要 maafw 可用"""
 
@@ -1,44 +1,149 @@
-"""压力测试 - 测量关键函数在高负载下的性能表现"""
+"""压力测试 - 测量关键函数在高负载下的性能表现
 
+运行示例：在仓库根目录执行 python -m tests.test_performance_stress
+对比两次保存的结果：python -m tests.test_performance_stress --compare <基准目录> <待比较目录>
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
 import time
+from array import array
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, NamedTuple
+
+import numpy as np
 import pytest
-from typing import Callable, Any, Optional, List, Dict
 
 from maa_mcp.vision import ocr, screencap
 from maa_mcp.control import click, swipe, input_text, click_key, scroll, double_click
-from maa_mcp.core import controller_info_registry, ControllerType
-from maa_mcp.adb import find_adb_device_list, connect_adb_device
-from maa_mcp.win32 import find_window_list, connect_window
+from maa_mcp.core import ControllerType
+from maa_mcp.adb import find_adb_device_list
+from maa_mcp.win32 import find_window_list
+from tests._stress_helpers import acquire_stress_controller, tool_fn
 
 
 def _call_tool(func, *args, **kwargs):
     """兼容模式：调用工具函数，自动处理 FunctionTool 和普通函数"""
-    # 如果 func 有 .fn 属性，说明是 FunctionTool，使用 .fn() 调用
-    if hasattr(func, 'fn'):
-        return func.fn(*args, **kwargs)
-    # 否则直接调用
-    return func(*args, **kwargs)
+    return tool_fn(func)(*args, **kwargs)
+
+
+def _result_arrays(results: list[PerformanceTestResult]) -> tuple[np.ndarray, np.ndarray]:
+    """将测试结果列表转换为耗时数组和成功标记数组"""
+    count = len(results)
+    times = np.fromiter((r.execution_time for r in results), dtype=np.float64, count=count)
+    success = np.fromiter((r.success for r in results), dtype=np.bool_, count=count)
+    return times, success
+
+
+def _summarize_times(times: np.ndarray) -> dict[str, float]:
+    """对成功调用的耗时数组做一次性批量统计（分位数共用一次排序）"""
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    return {
+        "total": float(times.sum()),
+        "mean": float(times.mean()),
+        "min": float(times.min()),
+        "max": float(times.max()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+    }
+
+
+def _relative_change(baseline: float, candidate: float) -> float:
+    """候选值相对基准值的变化比例；扣除计时器开销后耗时可能被截断为 0，此时返回 inf 或 nan"""
+    if baseline > 0:
+        return candidate / baseline - 1
+    return float("nan") if candidate == 0 else float("inf")
+
+
+def _save_result_arrays(
+    results_dir: str, function_name: str, times: np.ndarray, success: np.ndarray
+) -> Path:
+    """将逐次耗时和成功标记保存为 npz 文件，便于之后跨分支对比而无需重新压测"""
+    directory = Path(results_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    filepath = directory / f"{function_name}.npz"
+    np.savez_compressed(filepath, times=times, success=success)
+    return filepath
+
+
+def _calibrate_timer_overhead(samples: int = 1000) -> int:
+    """估算连续两次读取时钟的固有开销（纳秒），取最小值作为每次计时需扣除的固定开销"""
+    clock = time.perf_counter_ns
+    overhead = None
+    for _ in range(samples):
+        t0 = clock()
+        delta = clock() - t0
+        if overhead is None or delta < overhead:
+            overhead = delta
+    return overhead or 0
+
+
+# 计时器固有开销只在模块加载时校准一次
+_TIMER_OVERHEAD_NS = _calibrate_timer_overhead()
+
+def _coverage_active() -> bool:
+    """coverage 是否正在测量（仅导入了 coverage 模块不算）"""
+    if os.environ.get("COVERAGE_RUN"):
+        return True
+    try:
+        from coverage import Coverage
+    except ImportError:
+        return False
+    return Coverage.current() is not None
+
+
+# coverage（含 pytest-cov）会为每行代码插桩，测得的耗时会被放大数十倍，失去参考意义；
+# Python 3.12+ 的 sys.monitoring 模式不经过 sys.settrace，因此直接询问 coverage 本身
+_UNDER_COVERAGE = _coverage_active()
+
+
+@contextmanager
+def _gc_paused():
+    """在计时循环期间暂停循环垃圾回收，避免 GC 停顿混入测量结果；退出时恢复原状态"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
 
 
 class PerformanceTimer:
-    """性能计时器，用于测量函数执行时间"""
+    """性能计时器，用于测量函数执行时间
+
+    使用整数纳秒时钟 perf_counter_ns 计时，并扣除校准得到的计时器固有开销，
+    避免极快函数的测量结果被计时本身的开销主导。
+    """
 
     def __init__(self):
-        self.start_time: Optional[float] = None
-        self.end_time: Optional[float] = None
-        self.elapsed_time: Optional[float] = None
+        self.start_time: int | None = None  # 纳秒
+        self.end_time: int | None = None  # 纳秒
+        self.elapsed_time: float | None = None  # 秒
 
     def start(self):
         """开始计时"""
-        self.start_time = time.perf_counter()
         self.end_time = None
         self.elapsed_time = None
+        self.start_time = time.perf_counter_ns()
 
     def stop(self):
         """停止计时"""
+        end_time = time.perf_counter_ns()
         if self.start_time is not None:
-            self.end_time = time.perf_counter()
-            self.elapsed_time = self.end_time - self.start_time
+            self.end_time = end_time
+            elapsed_ns = end_time - self.start_time - _TIMER_OVERHEAD_NS
+            self.elapsed_time = max(elapsed_ns, 0) / 1e9
 
     def __enter__(self):
         """上下文管理器入口"""
@@ -50,20 +155,14 @@ class PerformanceTimer:
         self.stop()
 
 
+@dataclass(slots=True)
 class PerformanceTestResult:
-    """性能测试结果类"""
+    """性能测试结果类（使用 __slots__，大量结果对象不再各自携带 __dict__）"""
 
-    def __init__(
-        self,
-        function_name: str,
-        execution_time: float,
-        success: bool,
-        result: Any = None,
-    ):
-        self.function_name = function_name
-        self.execution_time = execution_time
-        self.success = success
-        self.result = result
+    function_name: str
+    execution_time: float
+    success: bool
+    result: Any = None
 
     def __str__(self):
         status = "成功" if self.success else "失败"
@@ -73,36 +172,47 @@ class PerformanceTestResult:
 class PerformanceBenchmarker:
     """性能基准测试工具，用于批量测试函数性能"""
 
-    def __init__(self):
-        self.results: List[PerformanceTestResult] = []
+    def __init__(self, store_results: bool = False):
+        self.results: list[PerformanceTestResult] = []
+        # 默认不保留函数返回值（如截图数据），避免结果列表长期持有大对象、加重 GC 压力
+        self.store_results = store_results
+        # 最近一次 run_multiple 的逐次耗时（秒）和成功标记，供批量统计使用
+        self.last_times: np.ndarray = np.empty(0, dtype=np.float64)
+        self.last_success: np.ndarray = np.empty(0, dtype=np.bool_)
 
     def benchmark(self, func: Callable, *args, **kwargs) -> PerformanceTestResult:
         """执行单次性能测试"""
+        test_result = self._measure(func, *args, **kwargs)
+        self.results.append(test_result)
+        return test_result
+
+    def _measure(self, func: Callable, *args, **kwargs) -> PerformanceTestResult:
+        """执行单次计时并返回结果，不写入 self.results（由批量接口统一追加）"""
+        call, func_name = self._prepare_call(func, args, kwargs, 0)
+        return self._measure_call(call, func_name)
+
+    def _measure_call(self, call: Callable, func_name: str) -> PerformanceTestResult:
+        """对已绑定参数的无参可调用对象执行单次计时"""
         timer = PerformanceTimer()
         success = False
         result = None
 
         try:
             timer.start()
-            # 兼容 FunctionTool 和普通函数
-            result = _call_tool(func, *args, **kwargs)
+            result = call()
             timer.stop()
             success = True
         except Exception as e:
             timer.stop()
-            print(f"[Error] {getattr(func, '__name__', str(func))} 执行失败: {e}")
-
-        # 获取函数名：优先使用 __name__，FunctionTool 使用 name 属性
-        func_name = getattr(func, '__name__', None) or getattr(func, 'name', str(func))
+            print(f"[Error] {func_name} 执行失败: {e}")
 
         test_result = PerformanceTestResult(
             function_name=func_name,
             execution_time=timer.elapsed_time or 0,
             success=success,
-            result=result,
+            result=result if self.store_results else None,
         )
 
-        self.results.append(test_result)
         return test_result
 
     def run_multiple(
@@ -111,47 +221,43 @@ class PerformanceBenchmarker:
         iterations: int = 5,
         print_stats: bool = True,
         *args,
+        warmup: int = 0,
         **kwargs,
-    ) -> List[PerformanceTestResult]:
-        """多次执行性能测试，获取平均时间"""
-        test_results = []
+    ) -> list[PerformanceTestResult]:
+        """多次执行性能测试，获取平均时间
 
-        total_start_time = time.perf_counter()
-        last_print_time = 0
+        warmup 次预热调用在计时窗口开始前执行，不计入结果和统计。
+        循环内只把耗时和成功标记写入预分配的原始缓冲区，不创建计时器或结果对象，
+        结果对象在循环结束后统一创建。
+        """
+        call, func_name = self._prepare_call(func, args, kwargs, warmup)
 
-        for i in range(iterations):
-            # 使用\r实现同一行滚动显示进度，限制刷新频率避免拖慢速度
-            current_time = time.perf_counter()
-            if iterations > 1 and print_stats:
-                # 每0.1秒或最后一次才刷新
-                if current_time - last_print_time > 0.1 or i == iterations - 1:
-                    print(
-                        f"\r[Iteration {i+1}/{iterations}] - 进行中...",
-                        end="",
-                        flush=True,
-                    )
-                    last_print_time = current_time
-
-            result = self.benchmark(func, *args, **kwargs)
-            test_results.append(result)
-
-        total_end_time = time.perf_counter()
-        total_wall_time = total_end_time - total_start_time
+        # 只在交互式终端中显示滚动进度，输出被捕获（如 pytest）或重定向时直接跳过
+        show_progress = iterations > 1 and print_stats and sys.stdout.isatty()
+        times, successes, returns, total_wall_time = self._timed_loop(
+            call, iterations, func_name, show_progress
+        )
 
-        # 完成后换行
-        if iterations > 1 and print_stats:
-            print()
+        # 循环结束后统一创建结果对象，并一次性追加到汇总结果
+        test_results = [
+            PerformanceTestResult(func_name, execution_time, success)
+            for execution_time, success in zip(times.tolist(), successes.tolist())
+        ]
+        if returns is not None:
+            for test_result, value in zip(test_results, returns):
+                test_result.result = value
+        self.results.extend(test_results)
 
         # 计算统计信息
         if test_results and print_stats:
-            success_times = [r.execution_time for r in test_results if r.success]
-            if success_times:
-                avg_time = sum(success_times) / len(success_times)
-                max_time = max(success_times)
-                min_time = min(success_times)
-                total_execution_time = sum(success_times)
-
-                print(f"\n[Statistics] {func.__name__}")
+            success_times = times[successes]
+            if success_times.size:
+                avg_time = success_times.mean()
+                max_time = success_times.max()
+                min_time = success_times.min()
+                total_execution_time = success_times.sum()
+
+                print(f"\n[Statistics] {func_name}")
                 print(f"  平均时间: {avg_time:.4f} 秒")
                 print(f"  最大时间: {max_time:.4f} 秒")
                 print(f"  最小时间: {min_time:.4f} 秒")
@@ -163,6 +269,206 @@ class PerformanceBenchmarker:
 
         return test_results
 
+    def run_multiple_arrays(
+        self,
+        func: Callable,
+        iterations: int = 5,
+        *args,
+        warmup: int = 0,
+        **kwargs,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """多次执行性能测试，直接返回 (耗时数组[秒], 成功标记数组)，不创建任何结果对象
+
+        与 run_multiple 的计时方式相同，适合只需要统计数据的压力测试。
+        """
+        call, func_name = self._prepare_call(func, args, kwargs, warmup)
+        times, successes, _, _ = self._timed_loop(call, iterations, func_name, False)
+        return times, successes
+
+    def _prepare_call(
+        self, func: Callable, args: tuple, kwargs: dict, warmup: int
+    ) -> tuple[Callable, str]:
+        """解析并绑定被测函数，完成预热，返回无参可调用对象和函数名"""
+        # 提前解析 FunctionTool 并绑定参数，循环内不再判断和解包参数
+        call = tool_fn(func)
+        if args or kwargs:
+            call = partial(call, *args, **kwargs)
+
+        # 预热：排除首次调用的初始化开销（连接、加载模型等）
+        for _ in range(warmup):
+            call()
+
+        func_name = getattr(func, '__name__', None) or getattr(func, 'name', str(func))
+        return call, func_name
+
+    def _timed_loop(
+        self, call: Callable, iterations: int, func_name: str, show_progress: bool
+    ) -> tuple[np.ndarray, np.ndarray, list[Any] | None, float]:
+        """计时主循环，返回 (耗时数组[秒], 成功标记数组, 返回值列表或 None, 墙钟耗时[秒])"""
+        # 原始耗时（纳秒）和成功标记，循环结束后零拷贝转换为 numpy 数组
+        times_buf = array("d", bytes(8 * iterations))
+        success_buf = bytearray(iterations)
+        returns: list[Any] | None = [None] * iterations if self.store_results else None
+        clock = time.perf_counter_ns
+        perf_counter = time.perf_counter
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+
+        total_start_time = perf_counter()
+        last_print_time = 0
+
+        with _gc_paused():
+            for i in range(iterations):
+                # 使用\r实现同一行滚动显示进度，限制刷新频率避免拖慢速度
+                if show_progress:
+                    current_time = perf_counter()
+                    # 每0.1秒或最后一次才刷新
+                    if current_time - last_print_time > 0.1 or i == iterations - 1:
+                        write(f"\r[Iteration {i+1}/{iterations}] - 进行中...")
+                        flush()
+                        last_print_time = current_time
+
+                start = clock()
+                try:
+                    value = call()
+                except Exception as e:
+                    times_buf[i] = clock() - start
+                    print(f"[Error] {func_name} 执行失败: {e}")
+                    continue
+                times_buf[i] = clock() - start
+                success_buf[i] = 1
+                if returns is not None:
+                    returns[i] = value
+
+        total_wall_time = perf_counter() - total_start_time
+
+        # 完成后换行
+        if show_progress:
+            write("\n")
+
+        # 统一扣除计时器固有开销并换算为秒
+        times = np.maximum(np.frombuffer(times_buf, dtype=np.float64) - _TIMER_OVERHEAD_NS, 0) / 1e9
+        successes = np.frombuffer(success_buf, dtype=np.bool_)
+        self.last_times = times
+        self.last_success = successes
+        return times, successes, returns, total_wall_time
+
+    def run_multiple_batched(
+        self,
+        func: Callable,
+        iterations: int = 5,
+        batch_size: int = 0,
+        print_stats: bool = True,
+        *args,
+        warmup: int = 0,
+        min_batch_time: float = 1e-3,
+        **kwargs,
+    ) -> list[PerformanceTestResult]:
+        """按批次计时：每批连续调用 batch_size 次，只计时一次再取平均（同 timeit 的做法）
+
+        适合单次耗时接近计时器开销的极快函数。batch_size <= 0 时按 1、10、100… 递增试探，
+        自动选择使每批耗时不少于 min_batch_time 秒的批大小。每个结果对应一批的平均单次耗时。
+        校准期间调用失败时不再计时，所有批次记为失败。
+        """
+        call, func_name = self._prepare_call(func, args, kwargs, warmup)
+
+        clock = time.perf_counter_ns
+        if batch_size <= 0:
+            # 与 timeit.Timer.autorange 相同的思路：批大小按 10 倍递增直到单批耗时足够长
+            batch_size = 1
+            try:
+                while True:
+                    start = clock()
+                    for _ in range(batch_size):
+                        call()
+                    if clock() - start >= min_batch_time * 1e9:
+                        break
+                    batch_size *= 10
+            except Exception as e:
+                print(f"[Error] {func_name} 执行失败: {e}")
+                batch_size = 0
+
+        times = np.zeros(iterations, dtype=np.float64)
+        successes = np.zeros(iterations, dtype=np.bool_)
+
+        if batch_size > 0:
+            batch = range(batch_size)
+            with _gc_paused():
+                for i in range(iterations):
+                    try:
+                        start = clock()
+                        for _ in batch:
+                            call()
+                        end = clock()
+                    except Exception as e:
+                        print(f"[Error] {func_name} 执行失败: {e}")
+                        continue
+                    times[i] = max(end - start - _TIMER_OVERHEAD_NS, 0) / 1e9 / batch_size
+                    successes[i] = True
+
+        self.last_times = times
+        self.last_success = successes
+
+        test_results = [
+            PerformanceTestResult(func_name, execution_time, success)
+            for execution_time, success in zip(times.tolist(), successes.tolist())
+        ]
+        self.results.extend(test_results)
+
+        if print_stats:
+            success_times = times[successes]
+            if success_times.size:
+                stats = _summarize_times(success_times)
+                print(f"\n[Batched Statistics] {func_name} (batch_size={batch_size})")
+                print(f"  平均时间: {stats['mean'] * 1e6:.3f} 微秒")
+                print(f"  中位数时间: {stats['p50'] * 1e6:.3f} 微秒")
+                print(f"  最小时间: {stats['min'] * 1e6:.3f} 微秒")
+                print(f"  最大时间: {stats['max'] * 1e6:.3f} 微秒")
+                print(f"  成功批次: {success_times.size}/{iterations}")
+
+        return test_results
+
+    def run_parallel(
+        self,
+        func: Callable,
+        iterations: int = 5,
+        workers: int = 4,
+        print_stats: bool = True,
+        *args,
+        warmup: int = 0,
+        **kwargs,
+    ) -> list[PerformanceTestResult]:
+        """使用线程池并发执行多次性能测试，衡量并发负载下的吞吐量"""
+        # 预热在单线程中完成，不计入结果和统计
+        call, func_name = self._prepare_call(func, args, kwargs, warmup)
+
+        total_start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._measure_call, call, func_name)
+                for _ in range(iterations)
+            ]
+            test_results = [future.result() for future in as_completed(futures)]
+        self.results.extend(test_results)
+
+        total_wall_time = time.perf_counter() - total_start_time
+
+        if test_results and print_stats:
+            success_times = [r.execution_time for r in test_results if r.success]
+            if success_times:
+                total_execution_time = sum(success_times)
+
+                print(f"\n[Parallel Statistics] {func_name} (workers={workers})")
+                print(f"  成功率: {len(success_times)}/{iterations}")
+                print(f"  总执行耗时 (Sum): {total_execution_time:.4f} 秒")
+                print(f"  总墙钟耗时 (Wall): {total_wall_time:.4f} 秒")
+                # 纯吞吐量按单次调用耗时之和计算，实际吞吐量按墙钟时间计算
+                print(f"  纯吞吐量 (Pure Throughput): {len(success_times) / total_execution_time:.2f} 次/秒")
+                print(f"  实际吞吐量 (Real Throughput): {len(success_times) / total_wall_time:.2f} 次/秒")
+
+        return test_results
+
     def print_summary(self):
         """打印所有测试结果摘要"""
         print("\n" + "=" * 50)
@@ -188,369 +494,227 @@ class PerformanceBenchmarker:
 
 
 class StressTestConfig:
-    """压力测试配置类"""
+    """压力测试配置类
+
+    以下配置可通过环境变量覆盖，无需修改源码：
+    - MAA_MCP_STRESS_ITERATIONS: 执行次数
+    - MAA_MCP_STRESS_WORKERS: 并发压力测试的线程数
+    - MAA_MCP_STRESS_RESULTS_DIR: 原始耗时 npz 文件的保存目录
+    """
 
     def __init__(self):
-        self.iterations = 10  # 默认执行次数
+        self.iterations = int(os.environ.get("MAA_MCP_STRESS_ITERATIONS", 10))  # 默认执行次数
         self.warmup_iterations = 10  # 预热迭代次数
-
-
+        # 并发压力测试的线程数，大于 1 时启用 *_parallel 测试
+        self.workers = int(os.environ.get("MAA_MCP_STRESS_WORKERS", 1))
+        # 设置后将每个测试的原始耗时保存为 npz 文件
+        self.results_dir: str | None = os.environ.get("MAA_MCP_STRESS_RESULTS_DIR") or None
+
+
+class StressCase(NamedTuple):
+    """单个压力测试用例"""
+
+    name: str  # 函数名，用作测试 ID 和统计标题
+    func: Callable  # 被测函数（已解析 FunctionTool.fn，可直接调用）
+    label: str  # 断言信息中的中文名称
+    kwargs: dict[str, Any] = {}  # 除 controller_id 外的调用参数
+    needs_controller: bool = True  # 是否需要传入 controller_id
+    windows_only: bool = False  # 是否仅支持 Windows 控制器
+    max_duration_ms: float | None = None  # 单次调用耗时上限
+    avg_duration_ms: float | None = None  # 平均耗时上限
+
+
+# 工具函数在模块加载时解析一次，测试中直接调用
+STRESS_CASES = [
+    StressCase("find_adb_device_list", tool_fn(find_adb_device_list), "find_adb_device_list", needs_controller=False),
+    StressCase("find_window_list", tool_fn(find_window_list), "find_window_list", needs_controller=False),
+    StressCase("ocr", tool_fn(ocr), "OCR", max_duration_ms=5000, avg_duration_ms=3000),
+    StressCase("screencap", tool_fn(screencap), "截图"),
+    StressCase("click", tool_fn(click), "点击", {"x": 100, "y": 100}),
+    StressCase(
+        "swipe",
+        tool_fn(swipe),
+        "滑动",
+        {"start_x": 100, "start_y": 100, "end_x": 200, "end_y": 200, "duration": 500},
+    ),
+    StressCase("input_text", tool_fn(input_text), "输入文本", {"text": "test"}),
+    StressCase("click_key", tool_fn(click_key), "按键点击", {"key": 13}),  # 13 是回车键的虚拟键码
+    StressCase("scroll", tool_fn(scroll), "滚动", {"x": 0, "y": -120}, windows_only=True),
+    StressCase("double_click", tool_fn(double_click), "双击", {"x": 100, "y": 100}),
+]
+
+# 并发压力测试只覆盖受 IO 阻塞的函数
+PARALLEL_STRESS_CASES = [
+    case for case in STRESS_CASES if case.name in ("find_adb_device_list", "screencap", "ocr")
+]
+
+
+@pytest.mark.skipif(_UNDER_COVERAGE, reason="coverage 插桩下压力测试数据无效，已跳过")
+@pytest.mark.skipif(sys.gettrace() is not None, reason="调试器/跟踪器处于激活状态，压力测试数据无效，已跳过")
 class TestStressPerformance:
     """压力测试类 - 测试关键函数在高负载下的性能"""
 
-    def setup_class(self):
-        """测试类初始化，获取实际控制器"""
-        self.config = StressTestConfig()
-        self.benchmarker = PerformanceBenchmarker()
-        self.controller_id = None
-        self.device_name = None
-        self.window_name = None
-
-        # 尝试获取ADB设备
+    @classmethod
+    def bind_controller(cls, controller: SimpleNamespace):
+        """测试类初始化：绑定控制器（见 _stress_helpers.acquire_stress_controller）并完成一次性预热"""
+        cls.config = StressTestConfig()
+        cls.benchmarker = PerformanceBenchmarker()
+        cls.controller_id = controller.controller_id
+        cls.device_name = controller.device_name
+        cls.window_name = controller.window_name
+        cls._is_adb = controller.controller_type == ControllerType.ADB
+
+        # 一次性初始化开销（创建 tasker、加载 OCR 模型、建立截图通道等）放在测试类初始化时完成，
+        # 各测试只需少量预热即可进入计时
+        cls._warmed = False
         try:
-            device_list = _call_tool(find_adb_device_list)
-            if device_list:
-                self.device_name = device_list[0]  # 使用第一个设备
-                self.controller_id = _call_tool(connect_adb_device, self.device_name)
-                print(
-                    f"  使用ADB设备: {self.device_name}, 控制器ID: {self.controller_id}"
-                )
-        except Exception as e:
-            print(f"  获取ADB设备失败: {e}")
-
-        # 如果没有ADB设备，尝试获取Windows窗口
-        if not self.controller_id:
-            try:
-                window_list = _call_tool(find_window_list)
-                if window_list:
-                    self.window_name = window_list[0]  # 使用第一个窗口
-                    self.controller_id = _call_tool(connect_window, self.window_name)
-                    print(
-                        f"  使用Windows窗口: {self.window_name}, 控制器ID: {self.controller_id}"
-                    )
-            except Exception as e:
-                print(f"  获取Windows窗口失败: {e}")
-
-        # 如果仍然没有控制器，跳过测试类
-        if not self.controller_id:
-            pytest.skip("未检测到可用的真实控制器设备/窗口，跳过压力性能测试")
-
-    def test_stress_find_adb_device_list(self):
-        """压力测试 - find_adb_device_list 函数"""
-        print(f"\n=== 压力测试: find_adb_device_list ({self.config.iterations}次) ===")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(find_adb_device_list)
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            find_adb_device_list,
-            iterations=self.config.iterations,
-            print_stats=False,
-        )
-
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "find_adb_device_list")
-
-    def test_stress_find_window_list(self):
-        """压力测试 - find_window_list 函数"""
-        print(f"\n=== 压力测试: find_window_list ({self.config.iterations}次) ===")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(find_window_list)
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            find_window_list,
-            iterations=self.config.iterations,
-            print_stats=False,
-        )
-
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "find_window_list")
-
-    def test_stress_ocr(self):
-        """压力测试 - OCR 函数"""
-        print(f"\n=== 压力测试: ocr ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(ocr, self.controller_id)
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            ocr,
-            iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-        )
-
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "ocr")
-
-        # 轻量级断言
-        assert results, "OCR 压力测试没有产生任何结果"
-        successes = [r for r in results if r.success]
-        success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"OCR 成功率过低: {success_ratio:.2%}"
-
-        durations_ms = [r.execution_time * 1000 for r in successes]
-        if durations_ms:
-            avg_duration = sum(durations_ms) / len(durations_ms)
-            max_duration = max(durations_ms)
-            assert max_duration < 5000, f"OCR 单次调用耗时过长: {max_duration:.1f} ms"
-            assert avg_duration < 3000, f"OCR 平均耗时过长: {avg_duration:.1f} ms"
-
-    def test_stress_screencap(self):
-        """压力测试 - 截图函数"""
-        print(f"\n=== 压力测试: screencap ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(screencap, self.controller_id)
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            screencap,
-            iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-        )
-
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "screencap")
-
-        # 轻量级断言
-        assert results, "截图压力测试没有产生任何结果"
-        successes = [r for r in results if r.success]
-        success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"截图成功率过低: {success_ratio:.2%}"
-
-    def test_stress_click(self):
-        """压力测试 - 点击函数"""
-        print(f"\n=== 压力测试: click ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(click, self.controller_id, 100, 100)
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            click,
-            iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-            x=100,
-            y=100,
+            _call_tool(screencap, cls.controller_id)
+            _call_tool(ocr, cls.controller_id)
+            _call_tool(click, cls.controller_id, 100, 100)
+            cls._warmed = True
+        except (OSError, RuntimeError) as e:
+            print(f"  预热控制器失败: {e}")
+
+    @pytest.fixture(autouse=True, scope="class")
+    def _bind_stress_controller(self, request, stress_controller):
+        """使用会话级共享控制器初始化测试类，设备查找和连接在整个会话中只执行一次"""
+        request.cls.bind_controller(stress_controller)
+
+    def setup_method(self, method):
+        """每个测试开始前回收上一个测试遗留的对象，避免其 GC 停顿落入本测试的计时窗口"""
+        gc.collect()
+
+    @property
+    def _warmup_iterations(self) -> int:
+        """单个测试的预热次数：测试类初始化时已完成预热则只需 1 次"""
+        return 1 if self._warmed else self.config.warmup_iterations
+
+    @pytest.mark.parametrize("case", STRESS_CASES, ids=lambda case: case.name)
+    def test_stress(self, case: StressCase):
+        """压力测试 - 按 STRESS_CASES 逐个测试关键函数"""
+        print(f"\n=== 压力测试: {case.name} ({self.config.iterations}次) ===")
+
+        kwargs = self._case_kwargs(case)
+
+        # 执行压力测试，耗时直接写入数组，不创建结果对象
+        times, success = self.benchmarker.run_multiple_arrays(
+            case.func,
+            self.config.iterations,
+            warmup=self._warmup_iterations,
+            **kwargs,
         )
 
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "click")
-
-        # 轻量级断言
-        assert results, "点击压力测试没有产生任何结果"
-        successes = [r for r in results if r.success]
-        success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"点击成功率过低: {success_ratio:.2%}"
-
-    def test_stress_swipe(self):
-        """压力测试 - 滑动函数"""
-        print(f"\n=== 压力测试: swipe ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
+        # 保存原始数据并打印详细统计信息
+        self._save_stress_results(times, success, case.name)
+        self._print_stress_test_stats(times, success, case.name)
 
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(swipe, self.controller_id, 100, 100, 200, 200, 500)
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            swipe,
-            iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-            start_x=100,
-            start_y=100,
-            end_x=200,
-            end_y=200,
-            duration=500,
-        )
-
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "swipe")
-
-        # 轻量级断言
-        assert results, "滑动压力测试没有产生任何结果"
-        successes = [r for r in results if r.success]
-        success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"滑动成功率过低: {success_ratio:.2%}"
-
-    def test_stress_input_text(self):
-        """压力测试 - 输入文本函数"""
-        print(f"\n=== 压力测试: input_text ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(input_text, self.controller_id, "test")
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            input_text,
-            iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-            text="test",
-        )
-
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "input_text")
-
-        # 轻量级断言
-        assert results, "输入文本压力测试没有产生任何结果"
-        successes = [r for r in results if r.success]
-        success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"输入文本成功率过低: {success_ratio:.2%}"
-
-    def test_stress_click_key(self):
-        """压力测试 - 按键点击函数"""
-        print(f"\n=== 压力测试: click_key ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(click_key, self.controller_id, 13)  # 13 是回车键的虚拟键码
-
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            click_key,
-            iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-            key=13,  # 13 是回车键的虚拟键码
-        )
-
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "click_key")
+        if not case.needs_controller:
+            return
 
         # 轻量级断言
-        assert results, "按键点击压力测试没有产生任何结果"
-        successes = [r for r in results if r.success]
-        success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"按键点击成功率过低: {success_ratio:.2%}"
-
-    def test_stress_scroll(self):
-        """压力测试 - 滚动函数"""
-        print(f"\n=== 压力测试: scroll ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
-
-        # 检查是否为 ADB 控制器
-        info = controller_info_registry.get(self.controller_id)
-        if info and info.controller_type == ControllerType.ADB:
-            pytest.skip("当前控制器为 ADB，跳过 scroll 压力测试 (仅支持 Windows)")
+        assert times.size, f"{case.label}压力测试没有产生任何结果"
+        success_ratio = success.mean()
+        assert success_ratio >= 0.8, f"{case.label}成功率过低: {success_ratio:.2%}"
+
+        durations_ms = times[success] * 1000
+        if durations_ms.size:
+            avg_duration = durations_ms.mean()
+            max_duration = durations_ms.max()
+            if case.max_duration_ms is not None:
+                assert max_duration < case.max_duration_ms, (
+                    f"{case.label}单次调用耗时过长: {max_duration:.1f} ms"
+                )
+            if case.avg_duration_ms is not None:
+                assert avg_duration < case.avg_duration_ms, (
+                    f"{case.label}平均耗时过长: {avg_duration:.1f} ms"
+                )
 
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(scroll, self.controller_id, 0, -120)
+    @pytest.mark.parametrize("case", PARALLEL_STRESS_CASES, ids=lambda case: case.name)
+    def test_stress_parallel(self, case: StressCase):
+        """并发压力测试 - 以 config.workers 个线程并发执行，测量并发负载下的吞吐量"""
+        workers = self.config.workers
+        if workers <= 1:
+            pytest.skip("StressTestConfig.workers <= 1，跳过并发压力测试")
 
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            scroll,
-            iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-            x=0,
-            y=-120,
+        print(
+            f"\n=== 并发压力测试: {case.name} "
+            f"({self.config.iterations}次, {workers}线程) ==="
         )
 
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "scroll")
-
-        # 轻量级断言
-        assert results, "滚动压力测试没有产生任何结果"
-        successes = [r for r in results if r.success]
-        success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"滚动成功率过低: {success_ratio:.2%}"
-
-    def test_stress_double_click(self):
-        """压力测试 - 双击函数"""
-        print(f"\n=== 压力测试: double_click ({self.config.iterations}次) ===")
-
-        if not self.controller_id:
-            pytest.skip("未检测到可用控制器")
-
-        # 预热
-        for _ in range(self.config.warmup_iterations):
-            _call_tool(double_click, self.controller_id, 100, 100)
+        kwargs = self._case_kwargs(case)
 
-        # 执行压力测试
-        results = self.benchmarker.run_multiple(
-            double_click,
+        results = self.benchmarker.run_parallel(
+            case.func,
             iterations=self.config.iterations,
-            print_stats=False,
-            controller_id=self.controller_id,
-            x=100,
-            y=100,
+            workers=workers,
+            warmup=self._warmup_iterations,
+            **kwargs,
         )
 
-        # 打印详细统计信息
-        self._print_stress_test_stats(results, "double_click")
+        # 保存原始数据（加 _parallel 后缀，避免覆盖串行测试的结果）并打印详细统计信息
+        times, success = _result_arrays(results)
+        self._save_stress_results(times, success, f"{case.name}_parallel")
+        self._print_stress_test_stats(times, success, case.name)
 
         # 轻量级断言
-        assert results, "双击压力测试没有产生任何结果"
+        assert results, f"{case.name} 并发压力测试没有产生任何结果"
         successes = [r for r in results if r.success]
         success_ratio = len(successes) / len(results)
-        assert success_ratio >= 0.8, f"双击成功率过低: {success_ratio:.2%}"
-
-    def _print_stress_test_stats(self, results: List, function_name: str):
-        """打印压力测试的详细统计信息"""
-        if not results:
+        assert success_ratio >= 0.8, f"{case.name} 并发成功率过低: {success_ratio:.2%}"
+
+    def _case_kwargs(self, case: StressCase) -> dict[str, Any]:
+        """检查用例的前置条件（不满足时跳过），并返回调用参数"""
+        kwargs = dict(case.kwargs)
+        if case.needs_controller:
+            if not self.controller_id:
+                pytest.skip("未检测到可用控制器")
+            kwargs["controller_id"] = self.controller_id
+        if case.windows_only and self._is_adb:
+            pytest.skip(f"当前控制器为 ADB，跳过 {case.name} 压力测试 (仅支持 Windows)")
+        return kwargs
+
+    def _save_stress_results(self, times: np.ndarray, success: np.ndarray, name: str):
+        """设置了 results_dir 时保存原始数据（含全部失败的运行），供 compare_saved_results 对比"""
+        if self.config.results_dir:
+            _save_result_arrays(self.config.results_dir, name, times, success)
+
+    def _print_stress_test_stats(
+        self, times: np.ndarray, success: np.ndarray, function_name: str
+    ):
+        """打印压力测试的详细统计信息（times 为秒，success 为布尔数组）"""
+        if not times.size:
             print(f"  未获取到测试结果")
             return
 
         # 筛选成功的测试结果
-        success_results = [r for r in results if r.success]
-        if not success_results:
+        success_times = times[success]
+        if not success_times.size:
             print(f"  所有测试都失败了")
             return
 
         # 计算统计数据
-        execution_times = [r.execution_time for r in success_results]
-        avg_time = sum(execution_times) / len(execution_times)
-        min_time = min(execution_times)
-        max_time = max(execution_times)
-        median_time = sorted(execution_times)[len(execution_times) // 2]
+        stats = _summarize_times(success_times)
 
         # 计算每秒处理次数（TPS）
-        tps = len(success_results) / sum(execution_times)
+        tps = success_times.size / stats["total"]
 
         print(f"\n[压力测试统计] {function_name}")
-        print(f"  总执行次数: {len(results)}")
-        print(f"  成功次数: {len(success_results)}")
-        print(f"  平均时间: {avg_time * 1000:.3f} 毫秒")
-        print(f"  最小时间: {min_time * 1000:.3f} 毫秒")
-        print(f"  最大时间: {max_time * 1000:.3f} 毫秒")
-        print(f"  中位数时间: {median_time * 1000:.3f} 毫秒")
+        print(f"  总执行次数: {times.size}")
+        print(f"  成功次数: {success_times.size}")
+        print(f"  平均时间: {stats['mean'] * 1000:.3f} 毫秒")
+        print(f"  最小时间: {stats['min'] * 1000:.3f} 毫秒")
+        print(f"  最大时间: {stats['max'] * 1000:.3f} 毫秒")
+        print(f"  中位数时间: {stats['p50'] * 1000:.3f} 毫秒")
+        print(f"  P95 时间: {stats['p95'] * 1000:.3f} 毫秒")
+        print(f"  P99 时间: {stats['p99'] * 1000:.3f} 毫秒")
+        # 尾延迟与中位数之比反映抖动程度（平均值会被离群值拉高，不宜作基准），
+        # 过大通常说明受到系统调度或 GC 干扰
+        jitter = stats["p99"] / stats["p50"] if stats["p50"] > 0 else 0.0
+        print(f"  P99/中位数: {jitter:.2f}x")
+        if jitter > 5:
+            print(f"  注意: 尾延迟远高于中位数，测量可能受到系统调度或 GC 干扰")
         print(f"  每秒处理次数 (TPS): {tps:.2f}")
-        print(f"  总耗时: {sum(execution_times) * 1000:.2f} 毫秒")
+        print(f"  总耗时: {stats['total'] * 1000:.2f} 毫秒")
 
 
 # 性能测试接口 - 为关键函数添加性能测试装饰器
@@ -559,31 +723,35 @@ class PerformanceTestInterface:
 
     @staticmethod
     def measure_function_performance(
-        func: Callable, iterations: int = 1000, *args, **kwargs
-    ) -> Dict[str, Any]:
+        func: Callable,
+        iterations: int = 1000,
+        *args,
+        benchmarker: PerformanceBenchmarker | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
         """测量函数在指定次数迭代下的性能
 
         Args:
             func: 要测试的函数
             iterations: 迭代次数
             *args: 函数参数
+            benchmarker: 复用的基准测试工具（可选），不提供时新建
             **kwargs: 函数关键字参数
 
         Returns:
             包含性能统计数据的字典
         """
-        benchmarker = PerformanceBenchmarker()
+        if benchmarker is None:
+            benchmarker = PerformanceBenchmarker()
 
-        # 预热
-        for _ in range(10):
-            func(*args, **kwargs)
-
-        # 执行测试
-        results = benchmarker.run_multiple(func, iterations, *args, **kwargs)
+        # 执行测试（前 10 次调用作为预热，不计入统计）
+        results = benchmarker.run_multiple(
+            func, iterations, True, *args, warmup=10, **kwargs
+        )
 
-        # 计算统计数据
-        success_results = [r for r in results if r.success]
-        if not success_results:
+        # 计算统计数据：直接使用 run_multiple 记录的耗时数组
+        success_times = benchmarker.last_times[benchmarker.last_success]
+        if not success_times.size:
             return {
                 "function_name": func.__name__,
                 "iterations": iterations,
@@ -591,37 +759,36 @@ class PerformanceTestInterface:
                 "message": "所有测试都失败了",
             }
 
-        success_times = [r.execution_time for r in success_results]
-        avg_time = sum(success_times) / len(success_times)
-        min_time = min(success_times)
-        max_time = max(success_times)
-        median_time = sorted(success_times)[len(success_times) // 2]
-        tps = len(success_results) / sum(success_times)
+        stats = _summarize_times(success_times)
 
         return {
             "function_name": func.__name__,
             "iterations": iterations,
             "success": True,
             "total_executions": len(results),
-            "successful_executions": len(success_results),
-            "average_time": avg_time,
-            "minimum_time": min_time,
-            "maximum_time": max_time,
-            "median_time": median_time,
-            "tps": tps,
-            "total_time": sum(success_times),
+            "successful_executions": int(success_times.size),
+            "average_time": stats["mean"],
+            "minimum_time": stats["min"],
+            "maximum_time": stats["max"],
+            "median_time": stats["p50"],
+            "p95_time": stats["p95"],
+            "p99_time": stats["p99"],
+            "tps": success_times.size / stats["total"],
+            "total_time": stats["total"],
         }
 
     @staticmethod
     def compare_function_performances(
-        functions: List[Callable], iterations: int = 1000
+        functions: list[Callable], iterations: int = 1000
     ):
         """比较多个函数的性能"""
         results = []
+        # 所有函数共用同一个基准测试工具
+        benchmarker = PerformanceBenchmarker()
 
         for func in functions:
             result = PerformanceTestInterface.measure_function_performance(
-                func, iterations
+                func, iterations, benchmarker=benchmarker
             )
             if result:
                 results.append(result)
@@ -631,40 +798,205 @@ class PerformanceTestInterface:
 
         return results
 
+    @staticmethod
+    def compare_saved_results(baseline_dir: str, candidate_dir: str) -> list[dict[str, Any]]:
+        """对比两次压测保存的 npz 结果（如两个分支各跑一次），打印并返回差异表
 
-# 压力测试示例脚本（可直接运行）
-if __name__ == "__main__":
-    """压力测试示例 - 展示如何使用压力测试模块"""
+        Args:
+            baseline_dir: 基准结果目录（StressTestConfig.results_dir）
+            candidate_dir: 待比较结果目录
 
-    print("MaaMCP 压力测试示例")
-    print("=" * 60)
+        Returns:
+            每个函数一行，包含两侧的平均/P50/P95 耗时（秒）及平均耗时变化比例
+            （基准平均耗时为 0 时变化比例为 inf，两侧均为 0 时为 nan）
+        """
+        rows = []
+        for baseline_file in sorted(Path(baseline_dir).glob("*.npz")):
+            candidate_file = Path(candidate_dir) / baseline_file.name
+            if not candidate_file.exists():
+                continue
+
+            with np.load(baseline_file) as base, np.load(candidate_file) as cand:
+                base_times = base["times"][base["success"]]
+                cand_times = cand["times"][cand["success"]]
+            if not base_times.size or not cand_times.size:
+                continue
+
+            base_stats = _summarize_times(base_times)
+            cand_stats = _summarize_times(cand_times)
+            rows.append({
+                "function_name": baseline_file.stem,
+                "baseline": {k: base_stats[k] for k in ("mean", "p50", "p95")},
+                "candidate": {k: cand_stats[k] for k in ("mean", "p50", "p95")},
+                "mean_change": _relative_change(base_stats["mean"], cand_stats["mean"]),
+            })
+
+        print(f"\n{'函数':<24}{'平均(ms)':>20}{'P50(ms)':>20}{'P95(ms)':>20}{'变化':>10}")
+        for row in rows:
+            base, cand = row["baseline"], row["candidate"]
+            cells = [
+                f"{base[k] * 1000:.3f}->{cand[k] * 1000:.3f}" for k in ("mean", "p50", "p95")
+            ]
+            print(
+                f"{row['function_name']:<24}{cells[0]:>20}{cells[1]:>20}{cells[2]:>20}"
+                f"{row['mean_change']:>+10.1%}"
+            )
 
-    # 创建压力测试配置
-    config = StressTestConfig()
-    config.iterations = 1000  # 使用1000次迭代进行完整的压力测试
+        return rows
+
+
+def _failing(value: int) -> int:
+    """用于测试失败路径：参数为负数时抛出异常"""
+    if value < 0:
+        raise ValueError("negative")
+    return value
 
-    # 创建测试实例
-    test = TestStressPerformance()
-    test.setup_class()
 
-    # 运行部分压力测试
-    print("\n1. 运行 find_adb_device_list 压力测试:")
-    test.test_stress_find_adb_device_list()
+class TestBenchmarker:
+    """用普通 Python 函数测试各种计时模式（不需要真实设备）"""
 
-    print("\n2. 运行 OCR 压力测试:")
-    test.test_stress_ocr()
+    def test_run_multiple_arrays(self):
+        benchmarker = PerformanceBenchmarker()
+        times, success = benchmarker.run_multiple_arrays(_failing, 5, 1, warmup=2)
+
+        assert times.shape == (5,)
+        assert success.all()
+        assert (times >= 0).all()
+        assert benchmarker.results == []  # 不创建结果对象
+
+    def test_run_multiple_arrays_failure(self):
+        times, success = PerformanceBenchmarker().run_multiple_arrays(_failing, 3, -1)
+
+        assert not success.any()
 
-    print("\n3. 运行 click 压力测试:")
-    test.test_stress_click()
+    def test_run_multiple_stores_results(self):
+        benchmarker = PerformanceBenchmarker(store_results=True)
+        results = benchmarker.run_multiple(_failing, 3, False, 7)
+
+        assert [r.result for r in results] == [7, 7, 7]
+        assert all(r.function_name == "_failing" for r in results)
+        assert benchmarker.results == results
+
+    def test_run_multiple_batched(self):
+        benchmarker = PerformanceBenchmarker()
+        results = benchmarker.run_multiple_batched(_failing, 3, 10, False, 1)
 
-    print("\n4. 运行 input_text 压力测试:")
-    test.test_stress_input_text()
+        assert len(results) == 3
+        assert all(r.success for r in results)
+        assert benchmarker.last_success.all()
 
-    print("\n5. 运行 scroll 压力测试:")
-    test.test_stress_scroll()
+    def test_run_multiple_batched_autorange_failure(self):
+        """测试自动选择批大小时调用失败不会抛出，所有批次记为失败"""
+        results = PerformanceBenchmarker().run_multiple_batched(_failing, 3, 0, False, -1)
 
-    print("\n6. 运行 double_click 压力测试:")
-    test.test_stress_double_click()
+        assert len(results) == 3
+        assert not any(r.success for r in results)
+
+    def test_run_parallel(self):
+        benchmarker = PerformanceBenchmarker()
+        results = benchmarker.run_parallel(_failing, 6, 3, False, 1, warmup=1)
+
+        assert len(results) == 6
+        assert all(r.success and r.function_name == "_failing" for r in results)
+
+    def test_run_parallel_failure(self):
+        results = PerformanceBenchmarker().run_parallel(_failing, 4, 2, False, -1)
+
+        assert len(results) == 4
+        assert not any(r.success for r in results)
+
+
+class TestSavedResults:
+    """测试压测结果的保存与对比（不需要真实设备）"""
+
+    def test_compare_saved_results(self, tmp_path):
+        times = np.array([0.001, 0.002, 0.003])
+        success = np.array([True, True, False])
+        _save_result_arrays(str(tmp_path / "base"), "ocr", times, success)
+        _save_result_arrays(str(tmp_path / "cand"), "ocr", times * 2, success)
+        # 只存在于一侧的结果不参与对比
+        _save_result_arrays(str(tmp_path / "base"), "click", times, success)
+
+        rows = PerformanceTestInterface.compare_saved_results(
+            str(tmp_path / "base"), str(tmp_path / "cand")
+        )
+
+        assert [row["function_name"] for row in rows] == ["ocr"]
+        assert rows[0]["baseline"]["mean"] == pytest.approx(0.0015)
+        assert rows[0]["mean_change"] == pytest.approx(1.0)
+
+    def test_compare_zero_baseline(self, tmp_path):
+        """测试基准平均耗时为 0（被截断）时不会除零"""
+        success = np.array([True, True])
+        _save_result_arrays(str(tmp_path / "base"), "fast", np.zeros(2), success)
+        _save_result_arrays(str(tmp_path / "cand"), "fast", np.full(2, 1e-6), success)
+        _save_result_arrays(str(tmp_path / "base"), "zero", np.zeros(2), success)
+        _save_result_arrays(str(tmp_path / "cand"), "zero", np.zeros(2), success)
+
+        rows = PerformanceTestInterface.compare_saved_results(
+            str(tmp_path / "base"), str(tmp_path / "cand")
+        )
+        changes = {row["function_name"]: row["mean_change"] for row in rows}
+
+        assert changes["fast"] == float("inf")
+        assert np.isnan(changes["zero"])
+
+
+# 压力测试示例脚本（可直接运行）
+if __name__ == "__main__":
+    """压力测试示例 - 展示如何使用压力测试模块
+
+    对比两次保存的结果（StressTestConfig.results_dir）：
+        python -m tests.test_performance_stress --compare <基准目录> <待比较目录>
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MaaMCP 压力测试示例")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE_DIR", "CANDIDATE_DIR"),
+        help="对比两次压测保存的 npz 结果后退出，不需要连接设备",
+    )
+    cli_args = parser.parse_args()
+    if cli_args.compare:
+        PerformanceTestInterface.compare_saved_results(*cli_args.compare)
+        sys.exit(0)
+
+    print("MaaMCP 压力测试示例")
+    print("=" * 60)
+
+    # 使用1000次迭代进行完整的压力测试（可通过环境变量 MAA_MCP_STRESS_ITERATIONS 覆盖）
+    os.environ.setdefault("MAA_MCP_STRESS_ITERATIONS", "1000")
+
+    # 查找并绑定控制器，创建测试实例
+    controller = acquire_stress_controller()
+    if not controller.controller_id:
+        print("未检测到可用的真实控制器设备/窗口，无法运行压力测试示例")
+        sys.exit(1)
+    TestStressPerformance.bind_controller(controller)
+    test = TestStressPerformance()
+
+    cases = {case.name: case for case in STRESS_CASES}
+
+    # 逐个串行计时：并发计时会争抢 CPU 和设备，互相干扰测量结果
+    for index, name in enumerate(
+        (
+            "find_adb_device_list",
+            "find_window_list",
+            "ocr",
+            "click",
+            "input_text",
+            "scroll",
+            "double_click",
+        ),
+        start=1,
+    ):
+        print(f"\n{index}. 运行 {name} 压力测试:")
+        try:
+            test.test_stress(cases[name])
+        except pytest.skip.Exception as e:
+            print(f"  跳过: {e}")
 
     print("\n" + "=" * 60)
     print("压力测试示例执行完成！")